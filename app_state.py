@@ -0,0 +1,29 @@
+"""
+App State - JSON files persisted between sessions
+"""
+
+import json
+import os
+from pathlib import Path
+
+
+STATE_DIR = Path(os.getenv("PR_MANAGER_STATE_DIR", Path.home() / ".cache" / "pr-manager")).expanduser()
+
+
+def load_state(name: str) -> dict:
+    """Load a state file, returning an empty dict if it is missing or unreadable"""
+    try:
+        with open(STATE_DIR / f"{name}.json", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(name: str, data: dict) -> None:
+    """Write a state file atomically so a crash never leaves it half-written"""
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+    path = STATE_DIR / f"{name}.json"
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
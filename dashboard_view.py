@@ -0,0 +1,94 @@
+"""
+Dashboard View - Widget for an at-a-glance view of the review queue
+"""
+
+from datetime import datetime, timezone
+
+from rich.console import Group
+from rich.table import Table
+from rich.text import Text
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.containers import VerticalScroll
+from textual.widgets import Static
+
+from review_queue_stats import ReviewQueueStats
+
+
+class DashboardView(VerticalScroll):
+    """Widget to display review queue aggregates"""
+
+    BINDINGS = [
+        Binding("down,j", "scroll_down", "Scroll Down", show=False),
+        Binding("up,k", "scroll_up", "Scroll Up", show=False),
+        Binding("pagedown", "page_down", "Page Down", show=False),
+        Binding("pageup", "page_up", "Page Up", show=False),
+    ]
+
+    def __init__(self, stats: ReviewQueueStats):
+        super().__init__()
+        self.stats = stats
+
+    def compose(self) -> ComposeResult:
+        """Compose the dashboard from the precomputed aggregates"""
+        yield Static(self._render_dashboard())
+
+    def _count_table(self, title: str, column: str, rows: list[tuple[str, int]]) -> Table:
+        """Create a two-column table of names and counts"""
+        table = Table(title=title, title_style="bold bright_cyan", header_style="bold cyan", box=None, expand=True)
+        table.add_column(column, ratio=1)
+        table.add_column("Open PRs", justify="right", style="bold yellow")
+        for name, count in rows:
+            table.add_row(name, str(count))
+        return table
+
+    def _render_dashboard(self) -> Group:
+        """Render the dashboard sections"""
+        now = datetime.now(timezone.utc)
+
+        header = Text()
+        header.append("Review Queue\n\n", style="bold bright_cyan")
+        header.append("Open PRs: ", style="white")
+        header.append(f"{len(self.stats)}", style="bold yellow")
+        header.append(" | ", style="dim white")
+        header.append("Awaiting Review: ", style="white")
+        header.append(f"{self.stats.awaiting_review_count}", style="bold yellow")
+        header.append("\n")
+
+        # Age histogram with proportional bars
+        histogram = self.stats.age_histogram(now)
+        largest = max((count for _, count in histogram), default=0) or 1
+        ages = Table(title="Age", title_style="bold bright_cyan", box=None, expand=True, show_header=False)
+        ages.add_column("Age", width=12)
+        ages.add_column("Bar", ratio=1)
+        ages.add_column("Count", justify="right", style="bold yellow")
+        for label, count in histogram:
+            ages.add_row(label, Text("█" * round(40 * count / largest), style="green"), str(count))
+
+        oldest = Table(
+            title="Oldest Awaiting Review",
+            title_style="bold bright_cyan",
+            header_style="bold cyan",
+            box=None,
+            expand=True,
+        )
+        oldest.add_column("Age", justify="right", width=6)
+        oldest.add_column("PR", ratio=1)
+        oldest.add_column("Author")
+        for entry in self.stats.oldest_awaiting_review():
+            oldest.add_row(
+                f"{(now - entry.created_at).days}d",
+                f"{entry.repo}#{entry.number} {entry.title}",
+                entry.author,
+            )
+
+        return Group(
+            header,
+            ages,
+            Text(""),
+            oldest,
+            Text(""),
+            self._count_table("Open PRs per Repository", "Repository", self.stats.top_repos()),
+            Text(""),
+            self._count_table("Open PRs per Author", "Author", self.stats.top_authors()),
+        )
@@ -0,0 +1,225 @@
+"""
+Diff Highlighter - Background syntax highlighting of diff hunks with a per-file cache
+"""
+
+import hashlib
+import multiprocessing
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from pygments.lexers import get_lexer_for_filename
+from pygments.styles import get_style_by_name
+from pygments.token import Text as TextToken
+from pygments.util import ClassNotFound
+
+
+HUNK_HEADER = re.compile(r'@@ -(\d+),?(\d*) \+(\d+),?(\d*) @@')
+
+# Per side: line number -> [(start, end, style)] spans over the line content
+LineSpans = dict[int, list[tuple[int, int, str]]]
+
+# Approximate memory cost of cached entries, lines and spans
+ENTRY_BYTES = 256
+LINE_BYTES = 120
+SPAN_BYTES = 80
+
+
+class DiffHighlighter:
+    """Tokenizes diff hunks in worker processes and caches the spans per file patch
+
+    Pygments is pure Python, so lexing runs in separate processes where it
+    cannot hold the GIL against the UI. Workers return plain span tuples;
+    the cache and its size accounting stay in this process.
+    """
+
+    def __init__(self, style: str = "monokai", max_workers: int = 2, max_entries: int = 512):
+        self.max_entries = max_entries
+        self.size = 0  # Estimated bytes held by the cache
+        self._style = style
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[str, dict[str, LineSpans] | None] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._pending: dict[str, Future] = {}
+        # Spawn rather than fork: forking the threaded UI process is unsafe
+        self._executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+    @staticmethod
+    def cache_key(filename: str, sha: str | None, patch: str) -> str:
+        """Key spans by the patch too: the same blob has other old-side lines against another base"""
+        digest = hashlib.blake2b(patch.encode("utf-8"), digest_size=8).hexdigest()
+        return f"{sha}:{filename}:{digest}"
+
+    def get(self, filename: str, sha: str | None, patch: str) -> dict[str, LineSpans] | None:
+        """Return cached spans for a file, None when not (yet) highlighted"""
+        key = self.cache_key(filename, sha, patch)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        return None
+
+    def submit(self, filename: str, sha: str | None, patch: str) -> Future | None:
+        """Queue a file for highlighting; returns None when it is already cached
+
+        The returned future completes once the spans are in the cache.
+        """
+        key = self.cache_key(filename, sha, patch)
+        with self._lock:
+            if key in self._cache:
+                return None
+            if key in self._pending:
+                return self._pending[key]
+            future = Future()
+            self._pending[key] = future
+        try:
+            worker = self._executor.submit(highlight_patch, filename, patch, self._style)
+        except RuntimeError as e:
+            # The pool is shut down or broken; show the file plain
+            self._store(key, None)
+            future.set_exception(e)
+            return future
+        worker.add_done_callback(lambda done: self._finish(key, done, future))
+        return future
+
+    def _finish(self, key: str, done: Future, future: Future) -> None:
+        """Cache a worker's result, then complete the future handed out by submit()"""
+        result = None
+        if not done.cancelled() and done.exception() is None:
+            result = done.result()
+        # Unknown languages and failures are cached too so they are not retried
+        self._store(key, result)
+        future.set_result(result)
+
+    def _store(self, key: str, result: dict[str, LineSpans] | None) -> None:
+        with self._lock:
+            self._pending.pop(key, None)
+            if key in self._cache:
+                return
+            self._cache[key] = result
+            self._sizes[key] = self._entry_size(result)
+            self.size += self._sizes[key]
+            while len(self._cache) > self.max_entries:
+                self._discard_oldest()
+
+    @staticmethod
+    def _entry_size(result: dict[str, LineSpans] | None) -> int:
+        size = ENTRY_BYTES
+        for side in (result or {}).values():
+            size += sum(LINE_BYTES + SPAN_BYTES * len(spans) for spans in side.values())
+        return size
+
+    def _discard_oldest(self) -> int:
+        key, _ = self._cache.popitem(last=False)
+        freed = self._sizes.pop(key)
+        self.size -= freed
+        return freed
+
+    def evict(self, nbytes: int) -> int:
+        """Drop least recently used entries until nbytes are freed; returns bytes freed"""
+        freed = 0
+        with self._lock:
+            while self._cache and freed < nbytes:
+                freed += self._discard_oldest()
+        return freed
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Everything below runs in the worker processes
+
+_styles: dict[str, tuple] = {}  # style name -> (Pygments style, token type -> Rich style)
+
+
+def highlight_patch(filename: str, patch: str, style: str) -> dict[str, LineSpans] | None:
+    """Lex both sides of every hunk; None when the language is unknown
+
+    Each side of a hunk (context plus removed lines, context plus added
+    lines) is lexed as one block so multi-line constructs such as strings
+    and comments are colored correctly.
+    """
+    try:
+        lexer = get_lexer_for_filename(filename, stripnl=False, ensurenl=False)
+    except ClassNotFound:
+        return None
+    result = {"old": {}, "new": {}}
+    for old_lines, new_lines in _split_hunks(patch):
+        result["old"].update(_lex_block(lexer, old_lines, style))
+        result["new"].update(_lex_block(lexer, new_lines, style))
+    return result
+
+
+def _split_hunks(patch: str):
+    """Yield the (line number, content) lines of both sides of every hunk"""
+    old_lines, new_lines = [], []
+    old_num = new_num = 0
+    for line in patch.split('\n'):
+        if line.startswith('@@'):
+            if old_lines or new_lines:
+                yield old_lines, new_lines
+            old_lines, new_lines = [], []
+            match = HUNK_HEADER.match(line)
+            if match:
+                old_num, new_num = int(match.group(1)), int(match.group(3))
+        elif line.startswith('---') or line.startswith('+++'):
+            continue
+        elif line.startswith('-'):
+            old_lines.append((old_num, line[1:]))
+            old_num += 1
+        elif line.startswith('+'):
+            new_lines.append((new_num, line[1:]))
+            new_num += 1
+        elif line.startswith(' '):
+            old_lines.append((old_num, line[1:]))
+            new_lines.append((new_num, line[1:]))
+            old_num += 1
+            new_num += 1
+    if old_lines or new_lines:
+        yield old_lines, new_lines
+
+
+def _lex_block(lexer, lines: list[tuple[int, str]], style: str) -> LineSpans:
+    """Lex consecutive lines as one block and split the tokens back per line"""
+    spans: LineSpans = {}
+    if not lines:
+        return spans
+    # Plain text keeps the diff's own add/remove/context color
+    plain_style = _rich_style(style, TextToken)
+    index = 0
+    offset = 0
+    current: list[tuple[int, int, str]] = []
+    for token_type, value in lexer.get_tokens("\n".join(content for _, content in lines)):
+        rich_style = _rich_style(style, token_type)
+        for i, part in enumerate(value.split("\n")):
+            if i > 0:
+                spans[lines[index][0]] = current
+                index += 1
+                offset = 0
+                current = []
+                if index >= len(lines):
+                    return spans
+            if part and rich_style and rich_style != plain_style:
+                current.append((offset, offset + len(part), rich_style))
+            offset += len(part)
+    spans[lines[index][0]] = current
+    return spans
+
+
+def _rich_style(style: str, token_type) -> str:
+    """Translate a Pygments token type to a Rich style string"""
+    if style not in _styles:
+        _styles[style] = (get_style_by_name(style), {})
+    pygments_style, cache = _styles[style]
+    if token_type not in cache:
+        definition = pygments_style.style_for_token(token_type)
+        parts = []
+        if definition["color"]:
+            parts.append(f"#{definition['color']}")
+        if definition["bold"]:
+            parts.append("bold")
+        if definition["italic"]:
+            parts.append("italic")
+        cache[token_type] = " ".join(parts)
+    return cache[token_type]
@@ -0,0 +1,374 @@
+"""
+GitHub Client - Shared HTTP transport and rate-limit budgeting for PyGithub clients
+"""
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import requests
+from github import Auth, Github
+from github.Requester import Requester
+
+
+# Open pull request listings; pages after the first address the repository by id
+PULLS_LISTING = re.compile(r"^(?:/api/v3)?/(?:repos/[^/]+/[^/]+|repositories/\d+)/pulls\?(?:.*&)?state=open(?:&|$)")
+
+# Org that requests made by the current thread are charged to, see charged_to()
+_thread_org = threading.local()
+
+
+@contextmanager
+def charged_to(org: str):
+    """Charge every request made by this thread to an org
+
+    Pagination URLs (/organizations/<id>/..., /repositories/<id>/...) do
+    not name the org, so a crawl thread declares it instead.
+    """
+    _thread_org.name = org.lower()
+    try:
+        yield
+    finally:
+        _thread_org.name = None
+
+
+def token_key(token: str) -> str:
+    """Return a short, non-reversible key identifying a token"""
+    return hashlib.sha256(token.encode()).hexdigest()[:12]
+
+
+class RateLimitBudget:
+    """Splits each token's remaining rate limit evenly between the orgs using it"""
+
+    # Requests kept back per token so interactive actions still work after a crawl
+    RESERVE = 100
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._orgs: dict[str, set[str]] = {}  # token key -> orgs crawled with it
+        self._remaining: dict[str, int] = {}  # token key -> last seen remaining
+        self._allowance: dict[tuple[str, str], int] = {}  # (token key, org) -> requests allowed
+        self._used: dict[tuple[str, str], int] = {}  # (token key, org) -> requests made
+
+    def register(self, token: str, org: str) -> None:
+        """Record that an org is crawled with the given token"""
+        with self._lock:
+            self._orgs.setdefault(token_key(token), set()).add(org.lower())
+
+    def start_crawl(self, token: str, remaining: int) -> None:
+        """Share the token's remaining requests between its orgs for a new crawl"""
+        key = token_key(token)
+        with self._lock:
+            self._remaining[key] = remaining
+            orgs = self._orgs.get(key, set())
+            if not orgs:
+                return
+            share = max(0, remaining - self.RESERVE) // len(orgs)
+            for org in orgs:
+                self._allowance[(key, org)] = share
+                self._used[(key, org)] = 0
+
+    def record(self, key: str, org: str | None, remaining: int | None, counted: bool = True) -> None:
+        """Account for one request made with a token on behalf of an org
+
+        Requests GitHub does not count (304 revalidations) only update the
+        remaining count.
+        """
+        with self._lock:
+            if remaining is not None:
+                self._remaining[key] = remaining
+            if counted and org is not None and (key, org) in self._used:
+                self._used[(key, org)] += 1
+
+    def exhausted(self, token: str, org: str) -> bool:
+        """Check whether an org has used up its share of the token's budget"""
+        key = (token_key(token), org.lower())
+        with self._lock:
+            if key not in self._allowance:
+                return False
+            if self._remaining.get(key[0], self.RESERVE + 1) <= self.RESERVE:
+                return True
+            return self._used[key] >= self._allowance[key]
+
+    def remaining(self, token: str) -> int | None:
+        """Return the last seen remaining requests for a token"""
+        with self._lock:
+            return self._remaining.get(token_key(token))
+
+
+@dataclass
+class CachedResponse:
+    """Validators and body of a cached GET response"""
+    etag: str | None
+    last_modified: str | None
+    headers: dict[str, str]
+    body: str
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers.items())
+
+    @property
+    def link(self) -> str | None:
+        return next((value for name, value in self.headers.items() if name.lower() == "link"), None)
+
+
+class ResponseCache:
+    """LRU cache of GET responses revalidated with ETag / Last-Modified
+
+    Entries are keyed per token and URL, since the same URL can return
+    different bodies for different credentials. A 304 reply is answered
+    from the cache and does not count against GitHub's rate limit.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, str], CachedResponse] = OrderedDict()
+        # URL -> (ETag, Last-Modified, Link) of open pulls listing pages, kept
+        # after eviction so a snapshot can revalidate the listings later
+        self._listings: dict[str, tuple[str | None, str | None, str | None]] = {}
+
+    def get(self, key: tuple[str, str]) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: tuple[str, str], entry: CachedResponse) -> None:
+        with self._lock:
+            if PULLS_LISTING.match(key[1]):
+                self._listings[key[1]] = (entry.etag, entry.last_modified, entry.link)
+            self._discard(key)
+            if entry.size > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self.size += entry.size
+            while self.size > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+
+    def bodies(self) -> list[tuple[str, str]]:
+        """Return the URL and body of every cached response"""
+        with self._lock:
+            return [(url, entry.body) for (_, url), entry in self._entries.items()]
+
+    def listings(self) -> dict[str, tuple[str | None, str | None, str | None]]:
+        """Return the (ETag, Last-Modified, Link) of every open pulls listing page seen"""
+        with self._lock:
+            return dict(self._listings)
+
+    def evict(self, nbytes: int) -> int:
+        """Drop least recently used entries until nbytes are freed; returns bytes freed"""
+        freed = 0
+        with self._lock:
+            while self._entries and freed < nbytes:
+                before = self.size
+                self._discard(next(iter(self._entries)))
+                freed += before - self.size
+        return freed
+
+    def _discard(self, key: tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    @property
+    def hit_rate(self) -> float | None:
+        """Share of cacheable requests answered from the cache, None before any request"""
+        total = self.hits + self.misses
+        return self.hits / total if total else None
+
+
+class PooledHTTPSConnection:
+    """PyGithub connection class that sends every request through one shared session
+
+    PyGithub creates a connection object (and with it a new requests session)
+    per client. Injecting this class instead makes all clients, whatever their
+    token or org, reuse a single keep-alive connection pool.
+    """
+
+    protocol = "https"
+    default_port = 443
+
+    budget: RateLimitBudget | None = None
+    cache: ResponseCache | None = None
+
+    _session: requests.Session | None = None
+    _session_lock = threading.Lock()
+
+    # Matches /orgs/<org>/... and /repos/<owner>/... so requests can be charged to an org
+    _ORG_PATH = re.compile(r"^/(?:api/v3/)?(?:orgs|repos)/([^/?]+)")
+
+    def __init__(self, host, port=None, strict=False, timeout=None, retry=None, pool_size=None, **kwargs):
+        self.host = host
+        self.port = port if port else self.default_port
+        self.timeout = timeout
+        self.verify = kwargs.get("verify", True)
+        self.session = self._shared_session(retry, pool_size)
+
+    @classmethod
+    def _shared_session(cls, retry, pool_size) -> requests.Session:
+        """Create the shared session on first use"""
+        with cls._session_lock:
+            if PooledHTTPSConnection._session is None:
+                session = requests.Session()
+                # Having Session.auth set disables falling back to the .netrc file
+                session.auth = Requester.noopAuth
+                adapter = requests.adapters.HTTPAdapter(
+                    max_retries=retry if retry is not None else requests.adapters.DEFAULT_RETRIES,
+                    pool_connections=pool_size or requests.adapters.DEFAULT_POOLSIZE,
+                    pool_maxsize=pool_size or requests.adapters.DEFAULT_POOLSIZE,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                PooledHTTPSConnection._session = session
+            return PooledHTTPSConnection._session
+
+    def request(self, verb, url, input, headers, stream=False):
+        self.verb = verb
+        self.url = url
+        self.input = input
+        self.headers = headers
+        self.stream = stream
+
+    def getresponse(self):
+        """Send the pending request over the shared session, revalidating cached GETs"""
+        headers = dict(self.headers or {})
+        cache_key = self._cache_key(headers)
+        cached = self.cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        send = getattr(self.session, self.verb.lower())
+        response = send(
+            f"{self.protocol}://{self.host}:{self.port}{self.url}",
+            headers=headers,
+            data=self.input,
+            timeout=self.timeout,
+            verify=self.verify,
+            allow_redirects=False,
+            stream=self.stream,
+        )
+        self._record(response)
+
+        if cache_key is None:
+            return PooledResponse(response.status_code, response.headers, response)
+        if response.status_code == 304 and cached is not None:
+            self.cache.record(hit=True)
+            # Replay the cached body with the fresh rate-limit headers
+            replay_headers = {**cached.headers, **response.headers}
+            return PooledResponse(200, replay_headers, body=cached.body)
+
+        self.cache.record(hit=False)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code == 200 and (etag or last_modified):
+            self.cache.put(cache_key, CachedResponse(etag, last_modified, dict(response.headers), response.text))
+        return PooledResponse(response.status_code, response.headers, response)
+
+    def _cache_key(self, headers: dict[str, str]) -> tuple[str, str] | None:
+        """Return the cache key for a cacheable request, None otherwise"""
+        if self.cache is None or self.verb != "GET" or self.stream:
+            return None
+        # Leave requests that already carry validators (PyGithub's update()) alone
+        if "If-None-Match" in headers or "If-Modified-Since" in headers:
+            return None
+        authorization = headers.get("Authorization", "")
+        return (token_key(authorization.split(" ")[-1]) if authorization else ""), self.url
+
+    def _record(self, response: requests.Response) -> None:
+        """Charge the request against the token's rate-limit budget unless it was a 304"""
+        if self.budget is None:
+            return
+        authorization = (self.headers or {}).get("Authorization", "")
+        if not authorization:
+            return
+        org = getattr(_thread_org, "name", None)
+        if org is None:
+            match = self._ORG_PATH.match(self.url)
+            org = match.group(1).lower() if match else None
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        self.budget.record(
+            token_key(authorization.split(" ")[-1]),
+            org,
+            int(remaining) if remaining is not None else None,
+            counted=response.status_code != 304,
+        )
+
+    def close(self):
+        """Keep the shared pool open; PyGithub closes connections after each request"""
+
+
+class PooledHTTPConnection(PooledHTTPSConnection):
+    """Plain HTTP variant of the pooled connection (GitHub Enterprise)"""
+
+    protocol = "http"
+    default_port = 80
+
+
+class PooledResponse:
+    """Response wrapper with the interface PyGithub expects"""
+
+    def __init__(self, status, headers, response: requests.Response | None = None, body: str | None = None):
+        self.status = status
+        self.headers = headers
+        self.response = response
+        self.body = body
+
+    def getheaders(self):
+        return self.headers.items()
+
+    def read(self):
+        return self.body if self.response is None else self.response.text
+
+    def iter_content(self, chunk_size=1):
+        if self.response is None:
+            return iter([self.body.encode()])
+        return self.response.iter_content(chunk_size=chunk_size)
+
+    def raise_for_status(self):
+        if self.response is not None:
+            self.response.raise_for_status()
+
+
+def install_pooled_transport(budget: RateLimitBudget, cache: ResponseCache | None = None) -> None:
+    """Route all PyGithub requests through the shared pool and response cache"""
+    PooledHTTPSConnection.budget = budget
+    PooledHTTPSConnection.cache = cache
+    Requester.injectConnectionClasses(PooledHTTPConnection, PooledHTTPSConnection)
+
+
+def create_clients(orgs: list[str], default_token: str, budget: RateLimitBudget) -> dict[str, tuple[Github, str]]:
+    """Create one Github client per token and map each org to its client and token
+
+    An org uses GITHUB_TOKEN_<ORG> when set (upper-cased, dashes as
+    underscores), otherwise the default token. Orgs sharing a token share
+    a client.
+    """
+    clients_by_token: dict[str, Github] = {}
+    clients: dict[str, tuple[Github, str]] = {}
+    for org in orgs:
+        token = os.getenv(f"GITHUB_TOKEN_{org.upper().replace('-', '_')}") or default_token
+        if token not in clients_by_token:
+            clients_by_token[token] = Github(auth=Auth.Token(token))
+        clients[org] = (clients_by_token[token], token)
+        budget.register(token, org)
+    return clients
@@ -3,26 +3,51 @@
 PR Manager TUI - A terminal user interface for managing pull requests
 """
 
+import argparse
 import os
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from typing import List, Optional
 
 from dotenv import load_dotenv
-from github import Auth, Github, PullRequest
+from github import Github, PullRequest
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Container
 from textual.widgets import Footer, Header, ListItem, ListView, Static
 
+from app_state import STATE_DIR
 from comment_screen import CommentScreen
+from dashboard_view import DashboardView
+from diff_highlighter import DiffHighlighter
+from github_client import (
+    CachedResponse,
+    RateLimitBudget,
+    ResponseCache,
+    charged_to,
+    create_clients,
+    install_pooled_transport,
+    token_key,
+)
+from memory_budget import MB, MemoryBudget
+from pr_comments import CommentLoader
 from pr_detail_view import PRDetailView
 from pr_files_view import PRFilesView
 from pr_list_view import PRListView
+from pr_store import PRRecord, PRRow
 from repo_filter_screen import RepoFilterScreen
+from repo_selector import RepoSelector
+from review_queue_stats import ReviewQueueStats
+from snapshot import Snapshot, diffs_from_cache, listings_from_cache, write_snapshot
+from view_history import ViewHistory
 
 
 load_dotenv()
 
+# PRs mounted per page; mounting ListItems gets slow past a few hundred,
+# so further pages are added as the cursor nears the end of the list
+LIST_PAGE_SIZE = 50
+
 
 class PRManagerApp(App):
     """A Textual app to manage pull requests."""
@@ -45,7 +70,7 @@ class PRManagerApp(App):
         background: $boost;
     }
 
-    PRDetailView {
+    PRDetailView, DashboardView {
         border: solid $primary;
         height: 100%;
         padding: 1 2;
@@ -64,26 +89,72 @@ class PRManagerApp(App):
         """Control which actions are available based on current view"""
         return True
 
-    def __init__(self):
+    def __init__(self, snapshot_path: str | None = None, offline: bool = False):
         super().__init__()
+        # A snapshot is shown at startup, then refreshed from GitHub unless offline
+        self.snapshot = Snapshot(snapshot_path) if snapshot_path else None
+        self.offline = offline
+        if offline and not self.snapshot:
+            raise ValueError("Offline mode requires a snapshot")
+        
         self.github_token = os.getenv("GITHUB_TOKEN")
-        self.github_org = os.getenv("GITHUB_ORG")
+        # GITHUB_ORG accepts a comma-separated list of organizations
+        self.github_orgs = [org.strip() for org in os.getenv("GITHUB_ORG", "").split(",") if org.strip()]
+        if offline:
+            self.github_orgs = self.snapshot.orgs
         
-        if not self.github_token:
+        if not self.github_token and not offline:
             raise ValueError("GITHUB_TOKEN environment variable is required")
-        if not self.github_org:
+        if not self.github_orgs:
             raise ValueError("GITHUB_ORG environment variable is required")
         
-        # Use new authentication method
-        auth = Auth.Token(self.github_token)
-        self.github = Github(auth=auth)
-        self.prs: List[PullRequest.PullRequest] = []
-        self.all_prs: List[PullRequest.PullRequest] = []  # Store all PRs before filtering
-        self.pr_list_items: List[tuple[str, str]] = []  # Cache for list items (label, id)
-        self.current_view = "list"  # Can be "list", "detail", or "files"
+        # All clients share one connection pool and response cache;
+        # each token's rate limit is split between its orgs
+        self.rate_budget = RateLimitBudget()
+        cache_mb = int(os.getenv("GITHUB_HTTP_CACHE_MB", "64"))
+        self.http_cache = ResponseCache(max_bytes=cache_mb * 1024 * 1024)
+        install_pooled_transport(self.rate_budget, self.http_cache)
+        self.clients: dict[str, tuple[Github, str]] = {}
+        if not offline:
+            self.clients = create_clients(self.github_orgs, self.github_token, self.rate_budget)
+        self.github = self.clients[self.github_orgs[0]][0] if self.clients else None
+        self.refreshing = False  # A background refresh after a warm start is running
+        self.list_stale = False  # PRs changed while the list was not shown
+        
+        # Skip repos that cannot have open PRs before listing their pulls
+        self.repo_selector = RepoSelector(
+            include=self._env_list("GITHUB_REPO_INCLUDE"),
+            exclude=self._env_list("GITHUB_REPO_EXCLUDE"),
+            include_forks=os.getenv("GITHUB_INCLUDE_FORKS", "").lower() in ("1", "true", "yes"),
+            max_age=timedelta(hours=float(os.getenv("GITHUB_KNOWN_EMPTY_MAX_HOURS", "24"))),
+        )
+        self.prs: List[PRRecord] = []
+        self.all_prs: List[PRRecord] = []  # Rows of all PRs before filtering; opened PRs are fetched in full
+        self.listed_repos: set[str] = set()  # Repos whose open pulls are all in all_prs, in listing order
+        self.pr_list_items: List[tuple[str, str]] = []  # Cache for list items (label, id), built as pages are shown
+        self.list_shown = 0  # PRs mounted in the list view
+        self.review_stats = ReviewQueueStats()  # Dashboard aggregates, updated as PRs load
+        self.diff_highlighter = DiffHighlighter()  # Syntax highlighting, cached per file SHA
+        self.view_history = ViewHistory()  # Head SHA per PR at the last files view
+        self.comment_loader = CommentLoader()  # Review and issue comments of recently viewed PRs
+        
+        # Memory accounting; caches are evicted in registration order when over budget
+        self.memory = MemoryBudget(int(os.getenv("PR_MANAGER_MEMORY_MB", "512")) * MB)
+        self.memory.register("Diff cache", lambda: self.diff_highlighter.size, self.diff_highlighter.evict)
+        self.memory.register("HTTP cache", lambda: self.http_cache.size, self.http_cache.evict)
+        self.memory.register("Comments", lambda: self.comment_loader.size, self.comment_loader.evict)
+        self.memory.register("PR store", self._pr_store_size)
+        self.memory.register("Rendered")
+        self.current_view = "list"  # Can be "list", "detail", "files" or "dashboard"
         self.current_pr = None  # Store current PR for navigation
         self.sort_order = "newest"  # Can be "newest" or "oldest"
         self.filtered_repo = None  # Currently filtered repository
+        self.filtered_org = None  # Currently filtered organization
+
+    @staticmethod
+    def _env_list(name: str) -> list[str]:
+        """Read a comma-separated environment variable"""
+        return [item.strip() for item in os.getenv(name, "").split(",") if item.strip()]
 
     def compose(self) -> ComposeResult:
         """Create child widgets for the app."""
@@ -95,9 +166,29 @@ class PRManagerApp(App):
         """Called when the app is mounted."""
         self.title = "PR Manager"
         self._update_subtitle()
-        self.load_prs()
+        if self.snapshot and not self.offline:
+            # Warm start: list the snapshot right away, refresh in the background
+            self._show_snapshot()
+            self._refresh_in_background()
+        else:
+            self.load_prs()
+        # Periodically enforce the memory budget and refresh the readout
+        self.set_interval(5, self._check_memory)
         # Force refresh of bindings to show initial state
         self.call_later(self.refresh_bindings)
+    
+    def _pr_store_size(self) -> int:
+        """Estimate the memory of the loaded PR rows"""
+        return sum(pr.size for pr in self.all_prs)
+    
+    def _check_memory(self) -> None:
+        """Evict caches if over the memory budget and update the readout"""
+        self.memory.enforce()
+        self._update_subtitle()
+    
+    def show_memory_status(self) -> None:
+        """Show memory usage per subsystem"""
+        self.notify("\n".join(self.memory.breakdown()), title="Memory", timeout=8)
 
     def toggle_sort_order(self) -> None:
         """Toggle sort order between newest and oldest"""
@@ -115,15 +206,39 @@ class PRManagerApp(App):
     def _update_subtitle(self) -> None:
         """Update subtitle with current order and filter info"""
         order_text = "Oldest First" if self.sort_order == "oldest" else "Newest First"
-        subtitle = f"Organization: {self.github_org} | Order: {order_text}"
+        label = "Organization" if len(self.github_orgs) == 1 else "Organizations"
+        subtitle = f"{label}: {', '.join(self.github_orgs)} | Order: {order_text}"
+        if self.offline:
+            subtitle += f" | Offline snapshot of {self.snapshot.created_at:%Y-%m-%d %H:%M}"
+        elif self.refreshing:
+            subtitle += " | Refreshing..."
+        if self.filtered_org:
+            subtitle += f" | Org: {self.filtered_org}"
         if self.filtered_repo:
             subtitle += f" | Repo: {self.filtered_repo}"
+        hit_rate = self.http_cache.hit_rate
+        if hit_rate is not None:
+            subtitle += f" | Cache: {hit_rate:.0%} hits"
+        subtitle += f" | {self.memory.status_text()}"
         self.sub_title = subtitle
     
+    def _pr_org(self, pr: PRRecord) -> str:
+        """Return the organization a PR belongs to"""
+        return pr.base.repo.owner.login
+    
+    def _pr_repo(self, pr: PRRecord) -> str:
+        """Return the repository label used for filtering (full name when several orgs are loaded)"""
+        if len(self.github_orgs) > 1:
+            return pr.base.repo.full_name
+        return pr.base.repo.name
+    
     def open_repo_filter(self) -> None:
         """Open repository filter dialog"""
-        # Get unique repository names from all PRs
-        repo_names = sorted(set(pr.base.repo.name for pr in self.all_prs))
+        # Get unique repository names from PRs in the filtered organization
+        repo_names = sorted(set(
+            self._pr_repo(pr) for pr in self.all_prs
+            if not self.filtered_org or self._pr_org(pr) == self.filtered_org
+        ))
         
         if not repo_names:
             return
@@ -137,13 +252,36 @@ class PRManagerApp(App):
             # Filter was applied (result is repo name or None for all)
             self.filtered_repo = result
             self._update_subtitle()
-            self._apply_repo_filter()
+            self._apply_filters()
+    
+    def open_org_filter(self) -> None:
+        """Open organization filter dialog"""
+        org_names = sorted(set(self._pr_org(pr) for pr in self.all_prs))
+        
+        if len(org_names) < 2:
+            return
+        
+        self.push_screen(
+            RepoFilterScreen(org_names, title="Filter by Organization", noun="organizations"),
+            self._handle_org_filter_result,
+        )
+    
+    def _handle_org_filter_result(self, result: str | None) -> None:
+        """Handle the result from the org filter screen"""
+        if result is not None:
+            self.filtered_org = result
+            # A repo filter from another organization would hide everything
+            if self.filtered_repo and len(self.github_orgs) > 1 and not self.filtered_repo.startswith(f"{result}/"):
+                self.filtered_repo = None
+            self._update_subtitle()
+            self._apply_filters()
     
     def clear_all_filters(self) -> None:
         """Clear all active filters"""
         self.filtered_repo = None
+        self.filtered_org = None
         self._update_subtitle()
-        self._apply_repo_filter()
+        self._apply_filters()
     
     def open_comment_dialog(self, pr: PullRequest.PullRequest) -> None:
         """Open comment dialog for a PR"""
@@ -160,14 +298,13 @@ class PRManagerApp(App):
             except Exception as e:
                 self.notify(f"Error adding comment: {str(e)}", severity="error", timeout=5)
     
-    def _apply_repo_filter(self) -> None:
-        """Apply repository filter to PRs"""
+    def _apply_filters(self) -> None:
+        """Apply organization and repository filters to PRs"""
+        self.prs = self.all_prs.copy()
+        if self.filtered_org:
+            self.prs = [pr for pr in self.prs if self._pr_org(pr) == self.filtered_org]
         if self.filtered_repo:
-            # Filter PRs by repository
-            self.prs = [pr for pr in self.all_prs if pr.base.repo.name == self.filtered_repo]
-        else:
-            # Show all PRs
-            self.prs = self.all_prs.copy()
+            self.prs = [pr for pr in self.prs if self._pr_repo(pr) == self.filtered_repo]
         
         # Re-sort and display
         self._sort_and_display_prs()
@@ -191,25 +328,216 @@ class PRManagerApp(App):
         # Clear and rebuild list
         list_view.clear()
         self.pr_list_items = []
-        
-        for pr in self.prs:
-            repo_name = pr.base.repo.name
-            label = f"#{pr.number} - {pr.title} ({repo_name}) by {pr.user.login}"
-            item_id = f"pr_{pr.base.repo.full_name.replace('/', '_').replace('-', '_')}_{pr.number}_{int(datetime.now().timestamp() * 1000000)}"
-            self.pr_list_items.append((label, item_id))
-            list_view.append(ListItem(Static(label), id=item_id))
+        self.list_shown = 0
         
         if not self.prs:
             list_view.append(ListItem(Static("No open pull requests found")))
+        else:
+            self._show_more_prs(list_view)
         
         list_view.focus()
     
+    def _list_item(self, index: int) -> tuple[str, str]:
+        """Return the (label, id) of a PR list item, building and caching it on first use"""
+        # Show an aligned organization column when several orgs are loaded
+        org_width = max(len(org) for org in self.github_orgs) if len(self.github_orgs) > 1 else 0
+        while len(self.pr_list_items) <= index:
+            pr = self.prs[len(self.pr_list_items)]
+            label = f"#{pr.number} - {pr.title} ({pr.base.repo.name}) by {pr.user.login}"
+            if org_width:
+                label = f"{self._pr_org(pr):<{org_width}}  {label}"
+            item_id = f"pr_{pr.base.repo.full_name.replace('/', '_').replace('-', '_')}_{pr.number}_{int(datetime.now().timestamp() * 1000000)}"
+            self.pr_list_items.append((label, item_id))
+        return self.pr_list_items[index]
+    
+    def _show_more_prs(self, list_view: ListView) -> None:
+        """Mount the next page of PRs in the list"""
+        end = min(self.list_shown + LIST_PAGE_SIZE, len(self.prs))
+        if end <= self.list_shown:
+            return
+        items = []
+        for index in range(self.list_shown, end):
+            label, item_id = self._list_item(index)
+            items.append(ListItem(Static(label), id=item_id))
+        list_view.extend(items)
+        self.list_shown = end
+    
+    def on_list_view_highlighted(self, event: ListView.Highlighted) -> None:
+        """Mount the next page when the cursor gets close to the last mounted PR"""
+        if self.current_view != "list" or event.list_view.index is None:
+            return
+        if event.list_view.index >= self.list_shown - LIST_PAGE_SIZE // 4:
+            self._show_more_prs(event.list_view)
+    
+    def _fetch_org_prs(self, org_name: str) -> tuple[List[PRRow], List[str], bool]:
+        """Fetch open PRs of one organization, stopping when its rate-limit share runs out
+        
+        Returns the PRs, the repos whose pulls were listed and whether the crawl was cut short.
+        """
+        github, token = self.clients[org_name]
+        prs = []
+        listed = []
+        # Pagination URLs carry numeric ids, so charge this thread's requests to the org
+        with charged_to(org_name):
+            org = github.get_organization(org_name)
+            
+            # Get all repositories in the organization
+            for repo in org.get_repos():
+                if self.rate_budget.exhausted(token, org_name):
+                    return prs, listed, True
+                if not self.repo_selector.should_fetch(repo):
+                    continue
+                # Get open pull requests for each repository
+                pr_count = 0
+                for pr in repo.get_pulls(state="open"):
+                    # Keep only the list fields; the PyGithub object is dropped
+                    row = PRRow.from_pr(pr)
+                    prs.append(row)
+                    self.review_stats.add(row)
+                    pr_count += 1
+                self.repo_selector.record(repo, pr_count)
+                listed.append(repo.full_name)
+        return prs, listed, False
+    
+    def _crawl_orgs(self) -> tuple[List[PRRow], set[str], List[str], List[tuple[str, str]]]:
+        """Crawl all organizations in parallel; returns PRs, listed repos, fully crawled orgs and notifications
+        
+        Does not touch widgets, so it can run in a worker thread.
+        """
+        self.review_stats.begin_refresh()
+        self.repo_selector.begin()
+        
+        # Share each token's remaining requests between the orgs crawled with it
+        clients_by_token = {token: github for github, token in self.clients.values()}
+        for token, github in clients_by_token.items():
+            self.rate_budget.start_crawl(token, github.rate_limiting[0])
+        
+        with ThreadPoolExecutor(max_workers=len(self.github_orgs)) as executor:
+            futures = {org: executor.submit(self._fetch_org_prs, org) for org in self.github_orgs}
+        
+        all_prs = []
+        listed_repos = set()
+        completed_orgs = []
+        messages = []
+        for org, future in futures.items():
+            try:
+                prs, listed, truncated = future.result()
+            except Exception as e:
+                if len(self.github_orgs) == 1:
+                    raise
+                messages.append((f"Error loading PRs for {org}: {str(e)}", "error"))
+                continue
+            all_prs.extend(prs)
+            listed_repos.update(listed)
+            if truncated:
+                messages.append((f"Rate-limit share used up for {org}; showing partial results", "warning"))
+            else:
+                completed_orgs.append(org)
+        return all_prs, listed_repos, completed_orgs, messages
+    
+    def _apply_crawl(
+        self,
+        prs: List[PRRow],
+        listed_repos: set[str],
+        completed_orgs: List[str],
+        messages: List[tuple[str, str]],
+    ) -> None:
+        """Store crawled PRs and report on the crawl"""
+        self.all_prs = prs
+        self.listed_repos = listed_repos
+        
+        # Drop closed PRs from the dashboard, keeping partially crawled orgs as they were
+        self.review_stats.end_refresh(completed_orgs)
+        
+        for message, severity in messages:
+            self.notify(message, severity=severity, timeout=5)
+        
+        self.repo_selector.save()
+        if self.repo_selector.saved_requests:
+            self.notify(self.repo_selector.summary(), timeout=5)
+    
+    def _show_snapshot(self) -> None:
+        """List the PRs of the loaded snapshot"""
+        self.all_prs = self.snapshot.rows(self.github_orgs)
+        self.listed_repos = self.snapshot.listed_repos(self.github_orgs)
+        self.review_stats.load(self.snapshot.stats_entries(self.all_prs))
+        self.prs = self.all_prs.copy()
+        self._sort_and_display_prs()
+        self.notify(
+            f"Loaded {len(self.all_prs)} PRs from snapshot taken {self.snapshot.created_at:%Y-%m-%d %H:%M}",
+            timeout=3,
+        )
+    
+    def _refresh_in_background(self) -> None:
+        """Crawl GitHub in a worker thread while the snapshot is shown"""
+        self.refreshing = True
+        self._update_subtitle()
+        
+        def crawl() -> None:
+            try:
+                self._seed_listings()
+                results = self._crawl_orgs()
+            except Exception as e:
+                self.call_from_thread(self._finish_background_refresh, None, e)
+                return
+            self.call_from_thread(self._finish_background_refresh, results, None)
+        
+        self.run_worker(crawl, thread=True)
+    
+    def _seed_listings(self) -> None:
+        """Put the snapshot's pulls listing pages in the HTTP cache
+        
+        Repos unchanged since the snapshot then revalidate with a 304,
+        which does not count against the rate limit.
+        """
+        keys = {token_key(token) for _, token in self.clients.values()}
+        for url, etag, last_modified, link, body in self.snapshot.listing_pages(self.github_orgs):
+            headers = {"Content-Type": "application/json; charset=utf-8"}
+            if link:
+                headers["Link"] = link
+            for key in keys:
+                self.http_cache.put((key, url), CachedResponse(etag, last_modified, headers, body))
+    
+    def _finish_background_refresh(self, results, error: Exception | None) -> None:
+        """Swap the snapshot for the live PRs, keeping filters and sort order"""
+        self.refreshing = False
+        if error is not None:
+            self.notify(f"Refresh failed, showing snapshot: {str(error)}", severity="error", timeout=5)
+        else:
+            self._apply_crawl(*results)
+            if self.current_view == "list":
+                self._apply_filters()
+            else:
+                # Rebuilt when going back to the list
+                self.list_stale = True
+            self.notify(f"Refreshed {len(self.all_prs)} PRs from GitHub", timeout=3)
+        self._update_subtitle()
+    
+    def export_snapshot(self) -> None:
+        """Write the loaded PRs and cached diffs to a snapshot file"""
+        path = os.path.expanduser(os.getenv("PR_MANAGER_SNAPSHOT", str(STATE_DIR / "snapshot.prms")))
+        diffs = dict(self.snapshot.all_diffs()) if self.snapshot else {}
+        diffs.update(diffs_from_cache(self.http_cache.bodies()))
+        listings = listings_from_cache(self.http_cache.listings(), self.all_prs, self.listed_repos)
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            write_snapshot(path, self.all_prs, self.github_orgs, diffs, listings)
+            self.notify(f"Exported {len(self.all_prs)} PRs and {len(diffs)} diffs to {path}", timeout=5)
+        except Exception as e:
+            self.notify(f"Error exporting snapshot: {str(e)}", severity="error", timeout=5)
+    
     def load_prs(self) -> None:
-        """Load pull requests from GitHub organization"""
+        """Load pull requests from all configured GitHub organizations"""
+        if self.refreshing:
+            self.notify("A refresh is already running", timeout=3)
+            return
+        
         self.prs = []
         self.all_prs = []
+        self.listed_repos = set()
         self.pr_list_items = []
-        self.filtered_repo = None  # Reset filter on reload
+        self.filtered_repo = None  # Reset filters on reload
+        self.filtered_org = None
         
         try:
             list_view = self.query_one("#pr_list", PRListView)
@@ -217,6 +545,10 @@ class PRManagerApp(App):
             # If list view doesn't exist, can't load PRs
             return
         
+        if self.offline:
+            self._show_snapshot()
+            return
+        
         # Clear existing items first
         list_view.clear()
         
@@ -224,16 +556,12 @@ class PRManagerApp(App):
         list_view.append(ListItem(Static("Loading PRs...")))
 
         try:
-            org = self.github.get_organization(self.github_org)
+            results = self._crawl_orgs()
             
             # Clear loading message
             list_view.clear()
             
-            # Get all repositories in the organization
-            for repo in org.get_repos():
-                # Get open pull requests for each repository
-                for pr in repo.get_pulls(state="open"):
-                    self.all_prs.append(pr)
+            self._apply_crawl(*results)
             
             # Copy all PRs to prs (no filter initially)
             self.prs = self.all_prs.copy()
@@ -247,7 +575,8 @@ class PRManagerApp(App):
             # Don't add ID to avoid conflicts when reloading
             list_view.append(ListItem(Static(f"Error loading PRs: {str(e)}")))
         finally:
-            # Ensure list has focus
+            # Refresh cache statistics and ensure list has focus
+            self._update_subtitle()
             list_view.focus()
     
     def restore_pr_list(self) -> None:
@@ -259,9 +588,10 @@ class PRManagerApp(App):
             # If query fails, create a new list view
             return
         
-        if self.pr_list_items:
-            for label, item_id in self.pr_list_items:
-                list_view.append(ListItem(Static(label), id=item_id))
+        self.list_shown = 0
+        if self.prs:
+            # Labels and ids of the PRs shown before are reused from the cache
+            self._show_more_prs(list_view)
         else:
             # Don't add ID to avoid conflicts
             list_view.append(ListItem(Static("No open pull requests found")))
@@ -270,7 +600,9 @@ class PRManagerApp(App):
         """Show file changes for a PR"""
         container = self.query_one(Container)
         container.remove_children()
-        files_view = PRFilesView(pr)
+        files_view = PRFilesView(
+            pr, self.diff_highlighter, self.memory, self.view_history, self.comment_loader.for_pr(pr)
+        )
         container.mount(files_view)
         files_view.focus()
         
@@ -278,17 +610,41 @@ class PRManagerApp(App):
         self.current_pr = pr
         self.refresh_bindings()
     
+    def show_dashboard(self) -> None:
+        """Show the review queue dashboard"""
+        container = self.query_one(Container)
+        container.remove_children()
+        dashboard = DashboardView(self.review_stats)
+        container.mount(dashboard)
+        dashboard.focus()
+        
+        self.current_view = "dashboard"
+        self.current_pr = None
+        self.refresh_bindings()
+    
+    def _resolve_pr(self, pr):
+        """Swap a PR row for the full, live PR when online"""
+        if not isinstance(pr, PRRecord) or self.offline:
+            return pr
+        clients = {org.lower(): github for org, (github, _) in self.clients.items()}
+        github = clients.get(pr.base.repo.owner.login.lower(), self.github)
+        try:
+            return github.get_repo(pr.base.repo.full_name, lazy=True).get_pull(pr.number)
+        except Exception as e:
+            self.notify(f"Showing list data only: {str(e)}", severity="warning", timeout=5)
+            return pr
+    
     def on_list_view_selected(self, event: ListView.Selected) -> None:
         """Handle when a PR is selected from the list"""
         if self.current_view == "list" and self.prs:
             list_view = self.query_one("#pr_list", ListView)
             if list_view.index is not None and list_view.index < len(self.prs):
-                selected_pr = self.prs[list_view.index]
+                selected_pr = self._resolve_pr(self.prs[list_view.index])
                 
                 # Remove the list view and show detail view
                 container = self.query_one(Container)
                 container.remove_children()
-                detail_view = PRDetailView(selected_pr)
+                detail_view = PRDetailView(selected_pr, self.comment_loader.for_pr(selected_pr))
                 container.mount(detail_view)
                 detail_view.focus()  # Give focus so arrow keys work
                 
@@ -301,12 +657,12 @@ class PRManagerApp(App):
         if self.current_view == "list" and self.prs:
             list_view = self.query_one("#pr_list", ListView)
             if list_view.index is not None and list_view.index < len(self.prs):
-                selected_pr = self.prs[list_view.index]
+                selected_pr = self._resolve_pr(self.prs[list_view.index])
                 
                 # Remove the list view and show detail view
                 container = self.query_one(Container)
                 container.remove_children()
-                detail_view = PRDetailView(selected_pr)
+                detail_view = PRDetailView(selected_pr, self.comment_loader.for_pr(selected_pr))
                 container.mount(detail_view)
                 detail_view.focus()  # Give focus so arrow keys work
                 
@@ -321,19 +677,25 @@ class PRManagerApp(App):
             if self.current_pr:
                 container = self.query_one(Container)
                 container.remove_children()
-                detail_view = PRDetailView(self.current_pr)
+                detail_view = PRDetailView(self.current_pr, self.comment_loader.for_pr(self.current_pr))
                 container.mount(detail_view)
                 detail_view.focus()
                 self.current_view = "detail"
                 self.refresh_bindings()
-        elif self.current_view == "detail":
+        elif self.current_view in ("detail", "dashboard"):
             # Go back to list view (restore from cache, no reload)
             container = self.query_one(Container)
             container.remove_children()
             list_view = PRListView(id="pr_list")
             container.mount(list_view)
-            self.restore_pr_list()  # Restore from cache instead of reloading
+            if self.list_stale:
+                # PRs were refreshed in the background meanwhile
+                self.list_stale = False
+                self._apply_filters()
+            else:
+                self.restore_pr_list()  # Restore from cache instead of reloading
             list_view.focus()  # Give focus to the list so arrow keys work
+            self._update_subtitle()  # Refresh cache statistics
             self.current_view = "list"
             self.current_pr = None
             self.refresh_bindings()  # Update footer bindings
@@ -344,8 +706,15 @@ class PRManagerApp(App):
 
 def main():
     """Main entry point"""
-    app = PRManagerApp()
+    parser = argparse.ArgumentParser(description="Terminal UI for managing GitHub pull requests")
+    parser.add_argument("--snapshot", help="show PRs from a snapshot file at startup, then refresh")
+    parser.add_argument("--offline", action="store_true", help="only use the snapshot, never contact GitHub")
+    args = parser.parse_args()
+    
+    app = PRManagerApp(snapshot_path=args.snapshot, offline=args.offline)
     app.run()
+    app.diff_highlighter.shutdown()
+    app.comment_loader.shutdown()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+"""
+Memory Budget - Per-subsystem memory accounting with eviction under pressure
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+# Overhead of one PR row besides its string contents (the tuple, the
+# string and int objects and the row itself)
+PR_ROW_BYTES = 900
+
+# A snapshot row is two slots over the memory-mapped file (plus the list pointer)
+SNAPSHOT_ROW_BYTES = 64
+
+MB = 1024 * 1024
+
+
+@dataclass
+class Subsystem:
+    """A memory consumer: how to measure it and, optionally, how to shrink it"""
+    name: str
+    size: Optional[Callable[[], int]] = None  # None means usage is pushed with set_usage()
+    evict: Optional[Callable[[int], int]] = None  # Frees at least the given bytes if it can, returns bytes freed
+    usage: int = 0
+
+    def current(self) -> int:
+        return self.size() if self.size else self.usage
+
+
+class MemoryBudget:
+    """Tracks estimated memory per subsystem and evicts caches when over budget
+
+    Subsystems are evicted in registration order, so register the cheapest
+    to rebuild first.
+    """
+
+    def __init__(self, limit_bytes: int):
+        self.limit = limit_bytes
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._subsystems: dict[str, Subsystem] = {}
+
+    def register(
+        self,
+        name: str,
+        size: Optional[Callable[[], int]] = None,
+        evict: Optional[Callable[[int], int]] = None,
+    ) -> None:
+        self._subsystems[name] = Subsystem(name, size, evict)
+
+    def set_usage(self, name: str, nbytes: int) -> None:
+        """Report the usage of a subsystem without its own size function"""
+        self._subsystems[name].usage = nbytes
+
+    def usage(self) -> dict[str, int]:
+        return {name: subsystem.current() for name, subsystem in self._subsystems.items()}
+
+    def total(self) -> int:
+        return sum(self.usage().values())
+
+    def share(self, fraction: float) -> int:
+        """Return a fraction of the budget, e.g. the allowance for rendered content"""
+        return int(self.limit * fraction)
+
+    def enforce(self) -> int:
+        """Evict from caches until usage fits the budget; returns bytes freed"""
+        with self._lock:
+            usage = self.usage()
+            excess = sum(usage.values()) - self.limit
+            pinned = sum(
+                nbytes for name, nbytes in usage.items() if self._subsystems[name].evict is None
+            )
+            if pinned >= self.limit:
+                # Emptying the caches could not get under budget, it would only slow everything down
+                return 0
+            freed = 0
+            for subsystem in self._subsystems.values():
+                if excess <= 0:
+                    break
+                if subsystem.evict is None:
+                    continue
+                released = subsystem.evict(excess)
+                if released:
+                    self.evictions += 1
+                freed += released
+                excess -= released
+            return freed
+
+    def status_text(self) -> str:
+        """Short readout for the subtitle"""
+        return f"Mem: {self.total() / MB:.0f}/{self.limit / MB:.0f} MB"
+
+    def breakdown(self) -> list[str]:
+        """One line per subsystem for the detailed readout"""
+        lines = [f"{name}: {nbytes / MB:.1f} MB" for name, nbytes in self.usage().items()]
+        lines.append(f"Total: {self.total() / MB:.1f} of {self.limit / MB:.0f} MB ({self.evictions} evictions)")
+        return lines
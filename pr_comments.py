@@ -0,0 +1,157 @@
+"""
+PR Comments - Review and issue comments loaded page by page in the background
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from github import PullRequest
+
+
+# GitHub's default page size, which PyGithub uses unless per_page is configured
+PAGE_SIZE = 30
+
+# Approximate memory of a comment object besides its body
+COMMENT_BYTES = 1024
+
+
+class CommentPager:
+    """Fetches one page of a PaginatedList at a time"""
+
+    def __init__(self, paginated):
+        self._paginated = paginated
+        self.items = []
+        self.next_page = 0
+        # Set by the stand-in lists of PR rows, which have nothing to fetch
+        self.unavailable: str | None = getattr(paginated, "unavailable", None)
+        self.has_more = self.unavailable is None
+
+    def load_next(self) -> list:
+        page = self._paginated.get_page(self.next_page)
+        self.items.extend(page)
+        self.next_page += 1
+        self.has_more = len(page) >= PAGE_SIZE
+        return page
+
+    @property
+    def size(self) -> int:
+        return sum(COMMENT_BYTES + len(comment.body or "") for comment in self.items)
+
+
+class PRComments:
+    """Review (inline) and issue (conversation) comments of one PR"""
+
+    def __init__(self, pr: PullRequest.PullRequest, executor: ThreadPoolExecutor):
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._pending: dict[str, Future] = {}
+        self.pagers = {
+            "review": CommentPager(pr.get_review_comments()),
+            "issue": CommentPager(pr.get_issue_comments()),
+        }
+
+    @property
+    def review(self) -> CommentPager:
+        return self.pagers["review"]
+
+    @property
+    def issue(self) -> CommentPager:
+        return self.pagers["issue"]
+
+    def load_next(self, kind: str) -> Future | None:
+        """Fetch the next page of "review" or "issue" comments; None when all are loaded"""
+        with self._lock:
+            if kind in self._pending:
+                return self._pending[kind]
+            if not self.pagers[kind].has_more:
+                return None
+            future = self._executor.submit(self._load, kind)
+            self._pending[kind] = future
+            return future
+
+    def _load(self, kind: str) -> list:
+        try:
+            return self.pagers[kind].load_next()
+        finally:
+            with self._lock:
+                self._pending.pop(kind, None)
+
+    def start(self, *kinds: str) -> list[Future]:
+        """Fetch the first page of each kind not loaded yet, concurrently"""
+        futures = []
+        for kind in kinds:
+            if self.pagers[kind].next_page == 0:
+                future = self.load_next(kind)
+                if future is not None:
+                    futures.append(future)
+            elif kind in self._pending:
+                futures.append(self._pending[kind])
+        return futures
+
+    def review_threads(self, path: str) -> dict[tuple[str, int], list[list]]:
+        """Group a file's loaded review comments into threads keyed by (side, line)
+
+        Replies are attached to the comment they answer; threads on lines
+        that no longer exist in the diff (outdated) have no line and are
+        keyed by (side, 0).
+        """
+        threads: dict[int, list] = {}
+        anchors: dict[int, tuple[str, int]] = {}
+        for comment in self.review.items:
+            if comment.path != path:
+                continue
+            if comment.in_reply_to_id and comment.in_reply_to_id in threads:
+                threads[comment.in_reply_to_id].append(comment)
+                continue
+            threads[comment.id] = [comment]
+            anchors[comment.id] = (comment.side or "RIGHT", comment.line or 0)
+
+        grouped: dict[tuple[str, int], list[list]] = {}
+        for thread_id, thread in threads.items():
+            grouped.setdefault(anchors[thread_id], []).append(thread)
+        return grouped
+
+    @property
+    def size(self) -> int:
+        return self.review.size + self.issue.size
+
+
+class CommentLoader:
+    """Owns the comment fetching pool and keeps comments of recently viewed PRs"""
+
+    def __init__(self, max_prs: int = 20, max_workers: int = 4):
+        self.max_prs = max_prs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="comments")
+        self._lock = threading.Lock()
+        self._comments: OrderedDict[tuple[str, int], PRComments] = OrderedDict()
+
+    def for_pr(self, pr: PullRequest.PullRequest) -> PRComments:
+        """Return the comments of a PR, creating (but not fetching) them on first use"""
+        key = (pr.base.repo.full_name, pr.number)
+        with self._lock:
+            # Comments of a PR row are kept only until the PR is opened from GitHub
+            if key not in self._comments or self._comments[key].issue.unavailable:
+                self._comments[key] = PRComments(pr, self._executor)
+                while len(self._comments) > self.max_prs:
+                    self._comments.popitem(last=False)
+            self._comments.move_to_end(key)
+            return self._comments[key]
+
+    @property
+    def size(self) -> int:
+        with self._lock:
+            return sum(comments.size for comments in self._comments.values())
+
+    def evict(self, nbytes: int) -> int:
+        """Forget comments of the least recently viewed PRs; returns bytes freed"""
+        freed = 0
+        with self._lock:
+            # Keep the most recent PR, it is likely on screen
+            while len(self._comments) > 1 and freed < nbytes:
+                _, comments = self._comments.popitem(last=False)
+                freed += comments.size
+        return freed
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -2,12 +2,17 @@
 PR Detail View - Widget for displaying pull request details
 """
 
+from concurrent.futures import wait
+
 from github import PullRequest
+from rich.text import Text
 from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.containers import VerticalScroll
 from textual.widgets import Static
 
+from pr_comments import PRComments
+
 
 class PRDetailView(VerticalScroll):
     """Widget to display PR details"""
@@ -19,6 +24,7 @@ class PRDetailView(VerticalScroll):
         Binding("pageup", "page_up", "Page Up", show=False),
         Binding("d", "view_files", "View Files", show=True),
         Binding("m", "add_comment", "Add Comment", show=True),
+        Binding("n", "more_comments", "More Comments", show=True),
     ]
     
     def action_view_files(self) -> None:
@@ -29,9 +35,64 @@ class PRDetailView(VerticalScroll):
         """Open dialog to add comment to this PR"""
         self.app.open_comment_dialog(self.pr)
 
-    def __init__(self, pr: PullRequest.PullRequest):
+    def action_more_comments(self) -> None:
+        """Load the next page of conversation comments"""
+        future = self.comments.load_next("issue")
+        if self.comments.issue.unavailable:
+            self.app.notify(self.comments.issue.unavailable, timeout=3)
+        elif future is not None:
+            self._wait_for_comments([future])
+
+    def __init__(self, pr: PullRequest.PullRequest, comments: PRComments):
         super().__init__()
         self.pr = pr
+        self.comments = comments
+
+    def on_mount(self) -> None:
+        """Fetch the first page of both comment kinds concurrently in the background"""
+        futures = self.comments.start("issue", "review")
+        if futures:
+            self._wait_for_comments(futures)
+        else:
+            self._render_discussion()
+
+    def _wait_for_comments(self, futures: list) -> None:
+        """Re-render the discussion once the given pages have loaded"""
+        def wait_and_render() -> None:
+            wait(futures)
+            errors = [future.exception() for future in futures if future.exception()]
+            self.app.call_from_thread(self._refresh_discussion, errors)
+
+        self.run_worker(wait_and_render, thread=True)
+
+    def _refresh_discussion(self, errors: list[BaseException]) -> None:
+        for error in errors:
+            self.app.notify(f"Error loading comments: {str(error)}", severity="error", timeout=5)
+        if self.is_attached:
+            self._render_discussion()
+
+    def _render_discussion(self) -> None:
+        """Render the loaded conversation comments"""
+        issue = self.comments.issue
+        review = self.comments.review
+
+        discussion = Text()
+        discussion.append("Discussion\n\n", style="bold bright_cyan")
+        for comment in issue.items:
+            discussion.append(f"{comment.user.login}", style="bold bright_yellow")
+            discussion.append(f"  {comment.created_at.strftime('%Y-%m-%d %H:%M')}\n", style="dim white")
+            discussion.append(f"{comment.body}\n\n", style="white")
+        if issue.unavailable:
+            discussion.append(f"{issue.unavailable}\n\n", style="dim italic")
+        elif not issue.items:
+            discussion.append("No comments\n\n", style="dim italic")
+        if issue.has_more:
+            discussion.append(f"{len(issue.items)} comments loaded, press n for more\n", style="dim italic")
+
+        if not review.unavailable:
+            review_count = f"{len(review.items)}{'+' if review.has_more else ''}"
+            discussion.append(f"Review comments: {review_count} (shown inline in the files view)\n", style="dim white")
+        self.query_one("#discussion", Static).update(discussion)
 
     def compose(self) -> ComposeResult:
         """Compose the detail view"""
@@ -69,3 +130,4 @@ class PRDetailView(VerticalScroll):
 **URL:** {self.pr.html_url}
 """
         yield Static(details)
+        yield Static("Loading comments...", id="discussion")
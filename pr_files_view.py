@@ -3,6 +3,8 @@ PR Files View - Widget for displaying file changes in a pull request
 """
 
 import re
+from concurrent.futures import wait
+
 from github import PullRequest
 from rich.console import Group
 from rich.table import Table
@@ -12,6 +14,18 @@ from textual.binding import Binding
 from textual.containers import VerticalScroll
 from textual.widgets import Static
 
+from diff_highlighter import DiffHighlighter, LineSpans
+from memory_budget import MemoryBudget
+from pr_comments import PRComments
+from view_history import ViewHistory
+
+
+# Approximate memory of a rendered diff table per byte of patch text
+RENDERED_BYTES_PER_PATCH_BYTE = 16
+
+# Share of the memory budget the rendered diffs of one PR may use
+RENDER_BUDGET_SHARE = 0.25
+
 
 class PRFilesView(VerticalScroll):
     """Widget to display PR file changes"""
@@ -21,11 +35,68 @@ class PRFilesView(VerticalScroll):
         Binding("up,k", "scroll_up", "Scroll Up", show=False),
         Binding("pagedown", "page_down", "Page Down", show=False),
         Binding("pageup", "page_up", "Page Up", show=False),
+        Binding("e", "expand_all", "Expand All", show=True),
+        Binding("v", "toggle_delta", "Full/Since Last View", show=True),
+        Binding("c", "toggle_threads", "Expand/Collapse Comments", show=True),
+        Binding("n", "more_comments", "More Comments", show=True),
     ]
 
-    def __init__(self, pr: PullRequest.PullRequest):
+    def __init__(
+        self,
+        pr: PullRequest.PullRequest,
+        highlighter: DiffHighlighter,
+        memory: MemoryBudget,
+        history: ViewHistory,
+        comments: PRComments,
+    ):
         super().__init__()
         self.pr = pr
+        self.highlighter = highlighter
+        self.memory = memory
+        self.history = history
+        self.comments = comments
+        self.threads_expanded = False  # Review threads are collapsed to one line by default
+        self.files = []
+        self.expand_all = False  # Render every diff even past the memory allowance
+        self.head_sha = None
+        self.since_sha = None  # Head SHA at the last visit, when it differs from the current head
+        self.delta_mode = False  # Show only the changes pushed since the last visit
+        # Only live PRs: rows (snapshot or unrefreshed list data) can be older than the view history
+        self.tracks_history = isinstance(pr, PullRequest.PullRequest)
+        self._file_sets: dict[bool, list] = {}  # delta_mode -> files, fetched on first use
+    
+    def action_toggle_delta(self) -> None:
+        """Switch between the full diff and the changes since the last visit"""
+        if self.since_sha is None:
+            self.app.notify("No changes since last view to compare against", timeout=3)
+            return
+        self.delta_mode = not self.delta_mode
+        self._load_files()
+    
+    def action_toggle_threads(self) -> None:
+        """Expand or collapse the inline review comment threads"""
+        self.threads_expanded = not self.threads_expanded
+        self._render_files()
+    
+    def action_more_comments(self) -> None:
+        """Load the next page of review comments"""
+        future = self.comments.load_next("review")
+        if self.comments.review.unavailable:
+            self.app.notify(self.comments.review.unavailable, timeout=3)
+        elif future is None:
+            self.app.notify("All review comments are loaded", timeout=3)
+        else:
+            self._wait_for_comments([future])
+    
+    def action_expand_all(self) -> None:
+        """Render diffs that were collapsed to stay within the memory budget"""
+        if not self.expand_all:
+            self.expand_all = True
+            self._render_files()
+    
+    def on_unmount(self) -> None:
+        """Release the rendered diffs from the memory accounting"""
+        self.memory.set_usage("Rendered", 0)
 
     def compose(self) -> ComposeResult:
         """Compose the files view"""
@@ -41,8 +112,41 @@ class PRFilesView(VerticalScroll):
             return old_start, new_start
         return None, None
     
-    def _create_side_by_side_diff(self, patch: str) -> Table:
-        """Create a side-by-side diff table"""
+    def _styled(self, content: str, style: str, spans: list[tuple[int, int, str]] | None) -> Text:
+        """Create diff line text with syntax highlighting spans applied when available"""
+        text = Text(content, style=style)
+        for start, end, span_style in spans or ():
+            text.stylize(span_style, start, end)
+        return text
+    
+    def _add_thread_rows(self, table: Table, threads: dict[tuple[str, int], list[list]], side: str, line_num: int) -> None:
+        """Add the review threads anchored on a diff line below it"""
+        anchored = threads.get((side, line_num))
+        if not anchored:
+            return
+        if self.threads_expanded:
+            text = Text()
+            for thread in anchored:
+                for comment in thread:
+                    text.append(f"💬 {comment.user.login}: ", style="bold bright_yellow on #1e293b")
+                    text.append(f"{comment.body}\n", style="white on #1e293b")
+            text.rstrip()
+        else:
+            count = sum(len(thread) for thread in anchored)
+            authors = ", ".join(dict.fromkeys(comment.user.login for thread in anchored for comment in thread))
+            text = Text(f"💬 {count} comment{'s' if count != 1 else ''} by {authors} (press c to expand)", style="italic bright_yellow on #1e293b")
+        if side == "LEFT":
+            table.add_row("", text, "", "")
+        else:
+            table.add_row("", "", "", text)
+    
+    def _create_side_by_side_diff(
+        self,
+        patch: str,
+        highlights: dict[str, LineSpans] | None = None,
+        threads: dict[tuple[str, int], list[list]] | None = None,
+    ) -> Table:
+        """Create a side-by-side diff table with review threads under their lines"""
         table = Table(
             show_header=True,
             header_style="bold cyan",
@@ -58,6 +162,9 @@ class PRFilesView(VerticalScroll):
         
         old_line_num = 0
         new_line_num = 0
+        old_spans = highlights["old"] if highlights else {}
+        new_spans = highlights["new"] if highlights else {}
+        threads = threads or {}
         
         for line in patch.split('\n'):
             if line.startswith('@@'):
@@ -78,37 +185,41 @@ class PRFilesView(VerticalScroll):
             elif line.startswith('-'):
                 # Removed line - show only on left
                 content = line[1:]  # Remove the '-' prefix
-                old_text = Text(content, style="#ef4444 on #7f1d1d")
+                old_text = self._styled(content, "#ef4444 on #7f1d1d", old_spans.get(old_line_num))
                 table.add_row(
                     str(old_line_num),
                     old_text,
                     "",
                     Text("", style="on #1f2937")
                 )
+                self._add_thread_rows(table, threads, "LEFT", old_line_num)
                 old_line_num += 1
                 
             elif line.startswith('+'):
                 # Added line - show only on right
                 content = line[1:]  # Remove the '+' prefix
-                new_text = Text(content, style="#22c55e on #14532d")
+                new_text = self._styled(content, "#22c55e on #14532d", new_spans.get(new_line_num))
                 table.add_row(
                     "",
                     Text("", style="on #1f2937"),
                     str(new_line_num),
                     new_text
                 )
+                self._add_thread_rows(table, threads, "RIGHT", new_line_num)
                 new_line_num += 1
                 
             elif line.startswith(' '):
                 # Context line - show on both sides
                 content = line[1:]  # Remove the ' ' prefix
-                context_text = Text(content, style="white on #1f2937")
+                context_text = self._styled(content, "white on #1f2937", old_spans.get(old_line_num))
                 table.add_row(
                     str(old_line_num),
                     context_text,
                     str(new_line_num),
-                    Text(content, style="white on #1f2937")
+                    self._styled(content, "white on #1f2937", new_spans.get(new_line_num))
                 )
+                self._add_thread_rows(table, threads, "LEFT", old_line_num)
+                self._add_thread_rows(table, threads, "RIGHT", new_line_num)
                 old_line_num += 1
                 new_line_num += 1
             elif line.strip():
@@ -120,28 +231,137 @@ class PRFilesView(VerticalScroll):
     def on_mount(self) -> None:
         """Load and display file changes when mounted"""
         try:
-            files = self.pr.get_files()
+            if self.tracks_history:
+                # The list payload can be hours old; compare and record the current head
+                self.pr.update()
+            self.head_sha = self.pr.head.sha
+            last_viewed = self.history.last_viewed_sha(self.pr) if self.tracks_history else None
+            if last_viewed and last_viewed != self.head_sha:
+                # Revisit after new pushes: start with only what changed since then
+                self.since_sha = last_viewed
+                self.delta_mode = True
+            self._load_files()
+        except Exception as e:
+            self._show_error(e)
+    
+    def _fetch_files(self, delta: bool) -> list:
+        """Fetch the full PR diff or the compare between the last viewed and current head"""
+        if not delta:
+            return list(self.pr.get_files())
+        comparison = self.pr.base.repo.compare(self.since_sha, self.head_sha)
+        # Compare diffs from the merge base; after a rebase that would add upstream changes
+        if comparison.status not in ("ahead", "identical") or comparison.behind_by:
+            raise ValueError(f"{self.since_sha[:7]} is not an ancestor of the current head (history was rewritten)")
+        return list(comparison.files)
+    
+    def _load_files(self) -> None:
+        """Fetch (once per mode) and display the files of the current mode"""
+        try:
+            if self.delta_mode not in self._file_sets:
+                try:
+                    self._file_sets[self.delta_mode] = self._fetch_files(self.delta_mode)
+                except Exception as e:
+                    if not self.delta_mode:
+                        raise
+                    # The old head may be gone, or no longer an ancestor, after a force-push
+                    self.app.notify(f"Cannot compare with last viewed commit: {str(e)}", severity="warning", timeout=5)
+                    self.since_sha = None
+                    self.delta_mode = False
+                    self._file_sets[False] = self._fetch_files(False)
+            self.files = self._file_sets[self.delta_mode]
+            if self.tracks_history:
+                self.history.mark_viewed(self.pr, self.head_sha)
             
+            # Render plain diffs first, then again once highlighting is ready
+            self._render_files()
+            pending = []
+            for file in self.files:
+                if file.patch:
+                    future = self.highlighter.submit(file.filename, file.sha, file.patch)
+                    if future is not None:
+                        pending.append(future)
+            if pending:
+                self.run_worker(lambda: self._wait_for_highlights(pending), thread=True)
+            
+            # Review comments are anchored once their first page arrives
+            comment_futures = self.comments.start("review")
+            if comment_futures:
+                self._wait_for_comments(comment_futures)
+            
+        except Exception as e:
+            self._show_error(e)
+    
+    def _wait_for_comments(self, futures: list) -> None:
+        """Re-render once the given review comment pages have loaded"""
+        def wait_and_render() -> None:
+            wait(futures)
+            errors = [future.exception() for future in futures if future.exception()]
+            self.app.call_from_thread(self._refresh_comments, errors)
+        
+        self.run_worker(wait_and_render, thread=True)
+    
+    def _refresh_comments(self, errors: list[BaseException]) -> None:
+        for error in errors:
+            self.app.notify(f"Error loading review comments: {str(error)}", severity="error", timeout=5)
+        if self.is_attached:
+            self._render_files()
+    
+    def _wait_for_highlights(self, pending: list) -> None:
+        """Wait in a worker thread for tokenization, then re-render on the UI thread"""
+        wait(pending)
+        self.app.call_from_thread(self._refresh_highlights)
+    
+    def _refresh_highlights(self) -> None:
+        """Re-render with highlighting if the view is still shown"""
+        if self.is_attached:
+            self._render_files()
+            self.memory.enforce()
+    
+    def _show_error(self, error: Exception) -> None:
+        """Replace the content with an error message"""
+        error_text = Text()
+        error_text.append("Error Loading Files\n\n", style="bold red")
+        error_text.append(str(error), style="white")
+        self.query_one(Static).update(error_text)
+    
+    def _render_files(self) -> None:
+        """Render all files, using whatever highlighting is cached"""
+        try:
             # Build rich content
             content_parts = []
             
             # Header
             header = Text()
-            header.append(f"File Changes for PR #{self.pr.number}\n\n", style="bold bright_cyan")
+            if self.delta_mode:
+                header.append(f"Changes Since Last View for PR #{self.pr.number}\n", style="bold bright_cyan")
+                header.append(f"{self.since_sha[:7]} → {self.head_sha[:7]} (press v for the full diff)\n\n", style="dim white")
+                changed_files = len(self.files)
+                additions = sum(file.additions for file in self.files)
+                deletions = sum(file.deletions for file in self.files)
+            else:
+                header.append(f"File Changes for PR #{self.pr.number}\n\n", style="bold bright_cyan")
+                changed_files = self.pr.changed_files
+                additions = self.pr.additions
+                deletions = self.pr.deletions
             header.append(f"Total Files Changed: ", style="white")
-            header.append(f"{self.pr.changed_files}", style="bold yellow")
+            header.append(f"{changed_files}", style="bold yellow")
             header.append(" | ", style="dim white")
             header.append(f"Additions: ", style="white")
-            header.append(f"+{self.pr.additions}", style="bold green")
+            header.append(f"+{additions}", style="bold green")
             header.append(" | ", style="dim white")
             header.append(f"Deletions: ", style="white")
-            header.append(f"-{self.pr.deletions}", style="bold red")
+            header.append(f"-{deletions}", style="bold red")
             header.append("\n\n")
             
             content_parts.append(header)
             content_parts.append(Text("─" * 80 + "\n\n", style="dim white"))
             
-            for file in files:
+            # Collapse diffs once the estimated rendered size passes the allowance
+            allowance = self.memory.share(RENDER_BUDGET_SHARE)
+            rendered_bytes = 0
+            collapsed = 0
+            
+            for file in self.files:
                 status_icon = {
                     "added": "🆕",
                     "removed": "🗑️",
@@ -177,16 +397,34 @@ class PRFilesView(VerticalScroll):
                 if file.status == "renamed":
                     file_info.append(f"Previous name: {file.previous_filename}\n", style="dim white")
                 
+                threads = self.comments.review_threads(file.filename)
+                if self.delta_mode:
+                    # Left-hand lines are from the last viewed commit, not the PR base
+                    threads = {anchor: anchored for anchor, anchored in threads.items() if anchor[0] == "RIGHT"}
+                outdated = sum(len(anchored) for (_, line), anchored in threads.items() if line == 0)
+                if outdated:
+                    file_info.append(f"{outdated} outdated review thread{'s' if outdated != 1 else ''}\n", style="dim yellow")
+                
                 content_parts.append(file_header)
                 content_parts.append(file_info)
                 content_parts.append(Text("\n"))
                 
                 # Patch content - side by side
                 if file.patch:
-                    # Create side-by-side diff table
-                    diff_table = self._create_side_by_side_diff(file.patch)
-                    content_parts.append(diff_table)
-                    content_parts.append(Text("\n"))
+                    cost = len(file.patch) * RENDERED_BYTES_PER_PATCH_BYTE
+                    if not self.expand_all and rendered_bytes + cost > allowance:
+                        collapsed += 1
+                        content_parts.append(Text(
+                            "Diff collapsed to stay within the memory budget (press e to expand all)\n",
+                            style="dim italic",
+                        ))
+                    else:
+                        rendered_bytes += cost
+                        # Create side-by-side diff table
+                        highlights = self.highlighter.get(file.filename, file.sha, file.patch)
+                        diff_table = self._create_side_by_side_diff(file.patch, highlights, threads)
+                        content_parts.append(diff_table)
+                        content_parts.append(Text("\n"))
                 else:
                     no_patch = Text("No patch available (binary file or too large)\n", style="dim italic")
                     content_parts.append(no_patch)
@@ -194,12 +432,13 @@ class PRFilesView(VerticalScroll):
                 # Separator
                 content_parts.append(Text("\n" + "─" * 80 + "\n", style="dim white"))
             
+            if collapsed:
+                header.append(f"{collapsed} diffs collapsed to stay within the memory budget\n\n", style="yellow")
+            
             # Update with all content parts (mix of Text and Table objects)
             static_widget = self.query_one(Static)
             static_widget.update(Group(*content_parts))
+            self.memory.set_usage("Rendered", rendered_bytes + sum(len(file.patch or "") for file in self.files))
             
         except Exception as e:
-            error_text = Text()
-            error_text.append("Error Loading Files\n\n", style="bold red")
-            error_text.append(str(e), style="white")
-            self.query_one(Static).update(error_text)
+            self._show_error(e)
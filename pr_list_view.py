@@ -14,7 +14,11 @@ class PRListView(ListView):
         Binding("r", "reload", "Reload", show=True),
         Binding("o", "toggle_order", "Toggle Order", show=True),
         Binding("f", "filter_repo", "Filter Repo", show=True),
+        Binding("g", "filter_org", "Filter Org", show=True),
         Binding("0", "clear_filters", "Clear Filters", show=True),
+        Binding("s", "dashboard", "Dashboard", show=True),
+        Binding("b", "memory_status", "Memory", show=True),
+        Binding("x", "export_snapshot", "Export Snapshot", show=True),
     ]
     
     def action_reload(self) -> None:
@@ -29,6 +33,22 @@ class PRListView(ListView):
         """Open repository filter dialog"""
         self.app.open_repo_filter()
     
+    def action_filter_org(self) -> None:
+        """Open organization filter dialog"""
+        self.app.open_org_filter()
+    
     def action_clear_filters(self) -> None:
         """Clear all filters"""
         self.app.clear_all_filters()
+    
+    def action_dashboard(self) -> None:
+        """Show the review queue dashboard"""
+        self.app.show_dashboard()
+    
+    def action_memory_status(self) -> None:
+        """Show memory usage per subsystem"""
+        self.app.show_memory_status()
+    
+    def action_export_snapshot(self) -> None:
+        """Export loaded PRs to a snapshot file"""
+        self.app.export_snapshot()
@@ -0,0 +1,205 @@
+"""
+PR Store - Lightweight rows holding the list fields of open PRs
+
+PyGithub PullRequest objects keep the whole list payload, including the
+head and base repository objects. The PR list only needs a few fields,
+so crawled PRs are reduced to rows and the full PR is fetched again
+when it is opened.
+"""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from github import PullRequest
+
+from memory_budget import PR_ROW_BYTES
+
+
+STRING_FIELDS = [
+    "org", "repo", "title", "author", "body", "state", "html_url",
+    "head_sha", "head_ref", "base_ref", "requested_reviewers", "requested_teams",
+]
+INT_FIELDS = ["number", "created_at", "updated_at", "draft"]
+
+
+class OfflineError(Exception):
+    """Raised when a PR row is asked for data that needs GitHub"""
+
+
+def pr_fields(pr) -> dict:
+    """Extract the stored fields of a PR or row; all are part of the pulls list payload"""
+    repo = pr.base.repo
+    return {
+        "org": repo.owner.login,
+        "repo": repo.full_name,
+        "title": pr.title,
+        "author": pr.user.login,
+        "body": pr.body or "",
+        "state": pr.state,
+        "html_url": pr.html_url,
+        "head_sha": pr.head.sha,
+        "head_ref": pr.head.ref,
+        "base_ref": pr.base.ref,
+        "requested_reviewers": ",".join(user.login for user in pr.requested_reviewers or []),
+        "requested_teams": ",".join(team.slug for team in pr.requested_teams or []),
+        "number": pr.number,
+        "created_at": int(pr.created_at.timestamp()),
+        "updated_at": int(pr.updated_at.timestamp()),
+        "draft": int(bool(pr.draft)),
+    }
+
+
+def list_payload(pr: "PRRecord") -> dict:
+    """Rebuild the part of a pulls list entry that pr_fields() reads"""
+    return {
+        "number": pr.number,
+        "title": pr.title,
+        "body": pr.body,
+        "state": pr.state,
+        "html_url": pr.html_url,
+        "draft": pr.draft,
+        "created_at": pr.created_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "updated_at": pr.updated_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "user": {"login": pr.user.login},
+        "head": {"sha": pr.head.sha, "ref": pr.head.ref},
+        "base": {
+            "ref": pr.base.ref,
+            "repo": {
+                "name": pr.base.repo.name,
+                "full_name": pr.base.repo.full_name,
+                "owner": {"login": pr.org},
+            },
+        },
+        "requested_reviewers": [{"login": user.login} for user in pr.requested_reviewers],
+        "requested_teams": [{"slug": team.slug} for team in pr.requested_teams],
+    }
+
+
+class _UnavailablePages:
+    """Stands in for a PaginatedList that would need GitHub; it has no pages"""
+
+    def __init__(self, what: str, reason: str):
+        # Read by CommentPager, which then never asks for a page
+        self.unavailable = f"{what} are {reason}"
+
+    def get_page(self, page: int) -> list:
+        raise OfflineError(self.unavailable)
+
+
+class PRRecord:
+    """Read-only stand-in for a PullRequest exposing the attributes the views read"""
+
+    __slots__ = ()
+
+    # Counts that need the full PR payload, which the list payload lacks
+    mergeable = None
+    comments = commits = changed_files = additions = deletions = "?"
+
+    # Why data beyond the list fields is missing
+    unavailable_reason = "not available without GitHub"
+
+    def _str(self, name: str) -> str:
+        raise NotImplementedError
+
+    def _int(self, name: str) -> int:
+        raise NotImplementedError
+
+    def _time(self, name: str) -> datetime:
+        return datetime.fromtimestamp(self._int(name), timezone.utc)
+
+    @property
+    def org(self) -> str:
+        return self._str("org")
+
+    @property
+    def number(self) -> int:
+        return self._int("number")
+
+    @property
+    def title(self) -> str:
+        return self._str("title")
+
+    @property
+    def body(self) -> str:
+        return self._str("body")
+
+    @property
+    def state(self) -> str:
+        return self._str("state")
+
+    @property
+    def html_url(self) -> str:
+        return self._str("html_url")
+
+    @property
+    def draft(self) -> bool:
+        return bool(self._int("draft"))
+
+    @property
+    def created_at(self) -> datetime:
+        return self._time("created_at")
+
+    @property
+    def updated_at(self) -> datetime:
+        return self._time("updated_at")
+
+    @property
+    def user(self) -> SimpleNamespace:
+        return SimpleNamespace(login=self._str("author"))
+
+    @property
+    def head(self) -> SimpleNamespace:
+        return SimpleNamespace(sha=self._str("head_sha"), ref=self._str("head_ref"))
+
+    @property
+    def base(self) -> SimpleNamespace:
+        full_name = self._str("repo")
+        repo = SimpleNamespace(
+            name=full_name.split("/", 1)[1],
+            full_name=full_name,
+            owner=SimpleNamespace(login=self.org),
+        )
+        return SimpleNamespace(ref=self._str("base_ref"), repo=repo)
+
+    @property
+    def requested_reviewers(self) -> list[SimpleNamespace]:
+        return [SimpleNamespace(login=login) for login in self._str("requested_reviewers").split(",") if login]
+
+    @property
+    def requested_teams(self) -> list[SimpleNamespace]:
+        return [SimpleNamespace(slug=slug) for slug in self._str("requested_teams").split(",") if slug]
+
+    def get_files(self) -> list:
+        raise OfflineError(f"The diff of this PR is {self.unavailable_reason}")
+
+    def get_review_comments(self) -> _UnavailablePages:
+        return _UnavailablePages("Review comments", self.unavailable_reason)
+
+    def get_issue_comments(self) -> _UnavailablePages:
+        return _UnavailablePages("Comments", self.unavailable_reason)
+
+    def create_issue_comment(self, body: str):
+        raise OfflineError("Cannot comment without GitHub")
+
+
+class PRRow(PRRecord):
+    """A PR reduced to its list fields, held in one tuple"""
+
+    __slots__ = ("_values", "size")
+
+    _INDEX = {name: i for i, name in enumerate(STRING_FIELDS + INT_FIELDS)}
+
+    def __init__(self, fields: dict):
+        self._values = tuple(fields[name] for name in STRING_FIELDS + INT_FIELDS)
+        # Estimated bytes held by the row
+        self.size = PR_ROW_BYTES + sum(len(fields[name]) for name in STRING_FIELDS)
+
+    @classmethod
+    def from_pr(cls, pr: PullRequest.PullRequest) -> "PRRow":
+        return cls(pr_fields(pr))
+
+    def _str(self, name: str) -> str:
+        return self._values[self._INDEX[name]]
+
+    def _int(self, name: str) -> int:
+        return self._values[self._INDEX[name]]
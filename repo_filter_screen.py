@@ -46,23 +46,25 @@ class RepoFilterScreen(ModalScreen[str]):
     }
     """
     
-    def __init__(self, repos: list[str]):
+    def __init__(self, repos: list[str], title: str = "Filter by Repository", noun: str = "repositories"):
         super().__init__()
         self.repos = sorted(repos)  # Sort alphabetically
         self.filtered_repos = self.repos.copy()
+        self.title_text = title
+        self.noun = noun
     
     def compose(self) -> ComposeResult:
         """Compose the filter dialog"""
         with Container(id="dialog"):
-            yield Label("Filter by Repository", id="title")
-            yield Label("Type to filter, then select a repository:", id="subtitle")
+            yield Label(self.title_text, id="title")
+            yield Label("Type to filter, then select an entry:", id="subtitle")
             yield Input(
-                placeholder="Type to filter repositories...",
+                placeholder=f"Type to filter {self.noun}...",
                 id="filter-input"
             )
             yield ListView(id="repo-list")
             with Vertical(id="buttons"):
-                yield Button("All Repos", variant="primary", id="all-button")
+                yield Button(f"All {self.noun.capitalize()}", variant="primary", id="all-button")
                 yield Button("Cancel", variant="default", id="cancel-button")
     
     def on_mount(self) -> None:
@@ -89,7 +91,7 @@ class RepoFilterScreen(ModalScreen[str]):
             for repo in self.filtered_repos:
                 list_view.append(ListItem(Label(repo)))
         else:
-            list_view.append(ListItem(Label("No repositories found", id="no-results")))
+            list_view.append(ListItem(Label(f"No {self.noun} found", id="no-results")))
     
     def on_input_changed(self, event: Input.Changed) -> None:
         """Handle input changes for filtering"""
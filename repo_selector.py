@@ -0,0 +1,124 @@
+"""
+Repo Selector - Skips repositories that cannot have open PRs before fetching them
+"""
+
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from fnmatch import fnmatch
+
+from github import Repository
+
+from app_state import load_state, save_state
+
+
+class RepoSelector:
+    """Decides from repository metadata which repos need their pulls fetched
+
+    Uses only fields of the org repos listing, so deciding costs nothing:
+    archived, disabled and (optionally) forked repos are skipped, as are
+    repos with no open issues (GitHub counts open PRs as issues). Repos
+    found without PRs are remembered as "known empty" and skipped until
+    they are pushed to or gain open issues, or until max_age has passed
+    since they were last listed (a fork PR opened while an issue closes
+    changes neither).
+    """
+
+    STATE_NAME = "known_empty_repos"
+
+    def __init__(
+        self,
+        include: list[str],
+        exclude: list[str],
+        include_forks: bool = False,
+        max_age: timedelta = timedelta(days=1),
+    ):
+        self.include = include
+        self.exclude = exclude
+        self.include_forks = include_forks
+        self.max_age = max_age
+        self.skipped: Counter[str] = Counter()  # reason -> repos skipped during the current load
+        self._lock = threading.Lock()
+        # full_name -> {"since", "checked_at", "pushed_at", "open_issues"}
+        self._known_empty: dict[str, dict] = load_state(self.STATE_NAME)
+
+    @property
+    def saved_requests(self) -> int:
+        """Pull requests listings not made during the current load (one request per skipped repo)"""
+        return sum(self.skipped.values())
+
+    def begin(self) -> None:
+        """Reset the counters for a new load"""
+        with self._lock:
+            self.skipped.clear()
+
+    def _matches(self, repo: Repository.Repository, patterns: list[str]) -> bool:
+        return any(fnmatch(repo.name, p) or fnmatch(repo.full_name, p) for p in patterns)
+
+    def _skip_reason(self, repo: Repository.Repository) -> str | None:
+        if self.include and not self._matches(repo, self.include):
+            return "not included"
+        if self._matches(repo, self.exclude):
+            return "excluded"
+        if repo.archived:
+            return "archived"
+        if getattr(repo, "disabled", False):
+            return "disabled"
+        if repo.fork and not self.include_forks:
+            return "fork"
+        if repo.open_issues_count == 0:
+            return "no open issues"
+        record = self._known_empty.get(repo.full_name)
+        if (
+            record
+            and not self._expired(record)
+            and repo.pushed_at is not None
+            and repo.pushed_at.isoformat() <= record["pushed_at"]
+            and repo.open_issues_count <= record["open_issues"]
+        ):
+            return "known empty"
+        return None
+
+    def _expired(self, record: dict) -> bool:
+        """Check whether a known-empty record is too old to trust"""
+        checked_at = datetime.fromisoformat(record.get("checked_at", record["since"]))
+        return datetime.now(timezone.utc) - checked_at > self.max_age
+
+    def should_fetch(self, repo: Repository.Repository) -> bool:
+        """Check whether a repo's open pulls need to be listed"""
+        reason = self._skip_reason(repo)
+        if reason is None:
+            return True
+        with self._lock:
+            self.skipped[reason] += 1
+        return False
+
+    def record(self, repo: Repository.Repository, pr_count: int) -> None:
+        """Remember whether a fetched repo turned out to have no open PRs"""
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            if pr_count or repo.pushed_at is None:
+                self._known_empty.pop(repo.full_name, None)
+            elif repo.full_name not in self._known_empty:
+                self._known_empty[repo.full_name] = {
+                    "since": now,
+                    "checked_at": now,
+                    "pushed_at": repo.pushed_at.isoformat(),
+                    "open_issues": repo.open_issues_count,
+                }
+            else:
+                # Still empty: move the watermark forward, keep the original date
+                self._known_empty[repo.full_name].update(
+                    checked_at=now,
+                    pushed_at=repo.pushed_at.isoformat(),
+                    open_issues=repo.open_issues_count,
+                )
+
+    def save(self) -> None:
+        with self._lock:
+            save_state(self.STATE_NAME, self._known_empty)
+
+    def summary(self) -> str:
+        """Describe what was skipped, e.g. for a notification"""
+        reasons = ", ".join(f"{count} {reason}" for reason, count in self.skipped.most_common())
+        return f"Skipped {self.saved_requests} repos ({reasons}), saving {self.saved_requests} requests"
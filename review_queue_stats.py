@@ -0,0 +1,173 @@
+"""
+Review Queue Stats - Incrementally maintained aggregates over the open PRs
+"""
+
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from github import PullRequest
+
+
+# Upper bounds of the age histogram buckets (the last bucket is open-ended)
+AGE_BUCKETS = [
+    ("< 1 day", timedelta(days=1)),
+    ("1-3 days", timedelta(days=3)),
+    ("3-7 days", timedelta(days=7)),
+    ("1-4 weeks", timedelta(weeks=4)),
+    ("1-3 months", timedelta(days=90)),
+    ("> 3 months", None),
+]
+
+
+@dataclass(frozen=True)
+class PRStatsEntry:
+    """The fields of a PR the dashboard needs, read once from the list payload"""
+    key: tuple[str, int]
+    org: str
+    repo: str
+    number: int
+    title: str
+    author: str
+    created_at: datetime
+    awaiting_review: bool
+
+    @classmethod
+    def from_pr(cls, pr: PullRequest.PullRequest) -> "PRStatsEntry":
+        # Only attributes present in the pulls list payload, so no lazy fetches
+        repo = pr.base.repo
+        return cls(
+            key=(repo.full_name, pr.number),
+            org=repo.owner.login,
+            repo=repo.full_name,
+            number=pr.number,
+            title=pr.title,
+            author=pr.user.login,
+            created_at=pr.created_at,
+            awaiting_review=bool(pr.requested_reviewers or pr.requested_teams),
+        )
+
+
+class ReviewQueueStats:
+    """Open-PR aggregates updated on every add/update/remove
+
+    Counters and sorted indexes are kept up to date as PRs stream in, so
+    reading the dashboard never walks the PR list or touches PyGithub.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, int], PRStatsEntry] = {}
+        self._generation: dict[tuple[str, int], int] = {}
+        self._current_generation = 0
+        self.per_repo: Counter[str] = Counter()
+        self.per_author: Counter[str] = Counter()
+        self._by_created: list[tuple[datetime, tuple[str, int]]] = []
+        self._awaiting_by_created: list[tuple[datetime, tuple[str, int]]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def begin_refresh(self) -> None:
+        """Start a reload; entries not seen again can be dropped by end_refresh()"""
+        with self._lock:
+            self._current_generation += 1
+
+    def end_refresh(self, orgs: list[str]) -> None:
+        """Remove PRs of fully crawled orgs that were not seen during this reload"""
+        orgs = {org.lower() for org in orgs}
+        with self._lock:
+            stale = [
+                key for key, entry in self._entries.items()
+                if entry.org.lower() in orgs and self._generation[key] != self._current_generation
+            ]
+            for key in stale:
+                self._remove(key)
+
+    def add(self, pr: PullRequest.PullRequest) -> None:
+        """Add a PR, or update it if it is already known"""
+        entry = PRStatsEntry.from_pr(pr)
+        with self._lock:
+            if entry.key in self._entries:
+                self._remove(entry.key)
+            self._entries[entry.key] = entry
+            self._generation[entry.key] = self._current_generation
+            self.per_repo[entry.repo] += 1
+            self.per_author[entry.author] += 1
+            insort(self._by_created, (entry.created_at, entry.key))
+            if entry.awaiting_review:
+                insort(self._awaiting_by_created, (entry.created_at, entry.key))
+
+    def load(self, entries: list[PRStatsEntry]) -> None:
+        """Replace all entries at once, sorting each index once instead of inserting one by one"""
+        entries = {entry.key: entry for entry in entries}
+        with self._lock:
+            self._current_generation += 1
+            self._entries = entries
+            self._generation = dict.fromkeys(entries, self._current_generation)
+            self.per_repo = Counter(entry.repo for entry in entries.values())
+            self.per_author = Counter(entry.author for entry in entries.values())
+            self._by_created = sorted((entry.created_at, key) for key, entry in entries.items())
+            self._awaiting_by_created = [item for item in self._by_created if entries[item[1]].awaiting_review]
+
+    def remove(self, key: tuple[str, int]) -> None:
+        """Remove a PR (e.g. closed or merged)"""
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: tuple[str, int]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        del self._generation[key]
+        self._decrement(self.per_repo, entry.repo)
+        self._decrement(self.per_author, entry.author)
+        self._discard_sorted(self._by_created, (entry.created_at, key))
+        if entry.awaiting_review:
+            self._discard_sorted(self._awaiting_by_created, (entry.created_at, key))
+
+    @staticmethod
+    def _decrement(counter: Counter, name: str) -> None:
+        counter[name] -= 1
+        if counter[name] <= 0:
+            del counter[name]
+
+    @staticmethod
+    def _discard_sorted(items: list, item) -> None:
+        index = bisect_left(items, item)
+        if index < len(items) and items[index] == item:
+            del items[index]
+
+    def age_histogram(self, now: datetime | None = None) -> list[tuple[str, int]]:
+        """Count PRs per age bucket using binary search on creation dates"""
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            histogram = []
+            remaining = len(self._by_created)  # PRs older than the previous bound
+            for label, bound in AGE_BUCKETS:
+                if bound is None:
+                    histogram.append((label, remaining))
+                    break
+                older = bisect_left(self._by_created, (now - bound,))
+                histogram.append((label, remaining - older))
+                remaining = older
+            return histogram
+
+    def oldest_awaiting_review(self, limit: int = 10) -> list[PRStatsEntry]:
+        """Return the oldest PRs that still have pending review requests"""
+        with self._lock:
+            return [self._entries[key] for _, key in self._awaiting_by_created[:limit]]
+
+    def top_repos(self, limit: int = 15) -> list[tuple[str, int]]:
+        with self._lock:
+            return self.per_repo.most_common(limit)
+
+    def top_authors(self, limit: int = 15) -> list[tuple[str, int]]:
+        with self._lock:
+            return self.per_author.most_common(limit)
+
+    @property
+    def awaiting_review_count(self) -> int:
+        return len(self._awaiting_by_created)
@@ -0,0 +1,374 @@
+"""
+Snapshot - Compact, versioned export of loaded PRs for sharing and offline use
+
+Layout (all integers little-endian):
+
+    magic "PRMSNAP" + format version byte
+    uint32 header length + JSON header (orgs, row count, column and diff offsets)
+    one block per column, 8-byte aligned:
+        int columns:    int64[count]
+        string columns: uint32[count + 1] offsets, then the UTF-8 data
+    optional zlib-compressed JSON of cached diffs
+
+The file is memory-mapped and rows decode their fields on access, so
+opening even a large snapshot only reads the header.
+
+The header also keeps the validators of each repo's open pulls listing.
+On a warm start the listing pages are rebuilt from the rows and put in
+the HTTP cache, so the refresh revalidates unchanged repos with 304s,
+which do not count against the rate limit.
+"""
+
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import dataclass
+from collections import Counter
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, parse_qsl, urlsplit
+
+from memory_budget import SNAPSHOT_ROW_BYTES
+from pr_store import INT_FIELDS, STRING_FIELDS, OfflineError, PRRecord, list_payload, pr_fields
+from review_queue_stats import PRStatsEntry
+
+
+MAGIC = b"PRMSNAP"
+VERSION = 2  # 2: column integers are little-endian instead of native order
+
+# Cached pull request file listings in the HTTP cache; pages after the
+# first (from the Link header) address the repository by numeric id
+FILES_URL = re.compile(r"^(?:/api/v3)?/(?:repos/([^/]+/[^/]+)|repositories/\d+)/pulls/(\d+)/files(?:\?(.*))?$")
+
+# Repository named in a listed file's contents_url
+CONTENTS_REPO = re.compile(r"/repos/([^/]+/[^/]+)/contents/")
+
+# GitHub's page size when the request does not set per_page
+DEFAULT_PAGE_SIZE = 30
+
+# First page of a repository's open pulls listing, and the next page in a Link header
+LISTING_FIRST_PAGE = re.compile(r"^(?:/api/v3)?/repos/([^/]+/[^/]+)/pulls\?(.*)$")
+NEXT_LINK = re.compile(r'<([^>]+)>;\s*rel="next"')
+
+FILE_FIELDS = ["filename", "status", "additions", "deletions", "patch", "sha", "previous_filename"]
+
+
+def diff_key(repo_full_name: str, number: int) -> str:
+    return f"{repo_full_name}#{number}"
+
+
+def diffs_from_cache(bodies) -> dict[str, list[dict]]:
+    """Collect cached PR file listings from (url, body) pairs of the HTTP cache
+
+    A listing is only kept when all of its pages are cached, since a
+    partial file list would look complete offline. When the last cached
+    page is exactly full, more pages may exist and the listing is skipped.
+    """
+    pages: dict[str, dict[int, list[dict]]] = {}  # diff key -> page number -> files
+    page_sizes: dict[str, int] = {}
+    for url, body in bodies:
+        match = FILES_URL.match(url)
+        if not match:
+            continue
+        full_name, number, query = match.groups()
+        files = json.loads(body)
+        if full_name is None:
+            # Numeric repository id: take the name from the files themselves
+            named = CONTENTS_REPO.search(files[0].get("contents_url") or "") if files else None
+            if named is None:
+                continue
+            full_name = named.group(1)
+        params = parse_qs(query or "")
+        key = diff_key(full_name, int(number))
+        pages.setdefault(key, {})[int(params.get("page", ["1"])[0])] = files
+        if "per_page" in params:
+            page_sizes[key] = int(params["per_page"][0])
+
+    diffs = {}
+    for key, listing in pages.items():
+        page_size = page_sizes.get(key, DEFAULT_PAGE_SIZE)
+        last = max(listing)
+        complete = (
+            set(listing) == set(range(1, last + 1))
+            and all(len(listing[page]) == page_size for page in range(1, last))
+            and len(listing[last]) < page_size
+        )
+        if complete:
+            diffs[key] = [
+                {field: file.get(field) for field in FILE_FIELDS}
+                for page in range(1, last + 1)
+                for file in listing[page]
+            ]
+    return diffs
+
+
+def _request_key(url: str) -> tuple[str, frozenset]:
+    parts = urlsplit(url)
+    return parts.path, frozenset(parse_qsl(parts.query))
+
+
+def listings_from_cache(validators: dict[str, tuple], prs: list[PRRecord], listed_repos: set[str]) -> dict[str, dict]:
+    """Collect the validators of the open pulls listings that the given PRs were crawled from
+
+    validators maps page URLs to (ETag, Last-Modified, Link), see
+    ResponseCache.listings(). A repo's rows are in listing order, so page
+    i holds the i-th run of per_page rows. Only repos fully listed by the
+    crawl that produced the rows are kept, and only when the page count
+    fits their number of rows.
+    """
+    counts = Counter(pr.base.repo.full_name for pr in prs)
+    # PyGithub re-encodes the query of Link URLs, so match pages by path and parameters
+    by_request = {_request_key(url): url for url in validators}
+    listings = {}
+    for url, (etag, last_modified, link) in validators.items():
+        match = LISTING_FIRST_PAGE.match(url)
+        if not match or match.group(1) not in listed_repos:
+            continue
+        repo = match.group(1)
+        page_size = int(parse_qs(match.group(2)).get("per_page", [DEFAULT_PAGE_SIZE])[0])
+        pages = [[url, etag, last_modified, link]]
+        while link and (next_link := NEXT_LINK.search(link)):
+            next_url = by_request.get(_request_key(next_link.group(1)))
+            if next_url is None or any(page[0] == next_url for page in pages):
+                pages = None
+                break
+            etag, last_modified, link = validators[next_url]
+            pages.append([next_url, etag, last_modified, link])
+        if pages is None:
+            continue
+        count = counts[repo]
+        if (len(pages) - 1) * page_size < count <= len(pages) * page_size or (count == 0 and len(pages) == 1):
+            listings[repo] = {"per_page": page_size, "pages": pages}
+    return listings
+
+
+def write_snapshot(
+    path: str,
+    prs: list,
+    orgs: list[str],
+    diffs: dict[str, list[dict]] | None = None,
+    listings: dict[str, dict] | None = None,
+) -> None:
+    """Write PRs (PyGithub or snapshot rows), optional diffs and listing validators to a snapshot file"""
+    rows = [pr_fields(pr) for pr in prs]
+    blocks: list[bytes] = []
+    columns: dict[str, dict] = {}
+    offset = 0
+
+    def little_endian(values: array) -> bytes:
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values.tobytes()
+
+    def add_block(name: str, kind: str, data: bytes) -> None:
+        nonlocal offset
+        padding = b"\0" * (-len(data) % 8)
+        columns[name] = {"type": kind, "offset": offset, "length": len(data)}
+        blocks.append(data + padding)
+        offset += len(data) + len(padding)
+
+    for name in INT_FIELDS:
+        add_block(name, "int", little_endian(array("q", (row[name] for row in rows))))
+    for name in STRING_FIELDS:
+        encoded = [row[name].encode("utf-8") for row in rows]
+        offsets = array("I", [0])
+        for value in encoded:
+            offsets.append(offsets[-1] + len(value))
+        add_block(name, "str", little_endian(offsets) + b"".join(encoded))
+
+    diff_block = None
+    if diffs:
+        data = zlib.compress(json.dumps(diffs).encode("utf-8"))
+        diff_block = {"offset": offset, "length": len(data)}
+        blocks.append(data)
+
+    header = json.dumps({
+        "version": VERSION,
+        "byteorder": "little",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "orgs": orgs,
+        "count": len(rows),
+        "columns": columns,
+        "diffs": diff_block,
+        "listings": listings or {},
+    }).encode("utf-8")
+    # Align the first block so int columns can be cast in place
+    prefix_length = len(MAGIC) + 1 + 4 + len(header)
+    header += b" " * (-prefix_length % 8)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + bytes([VERSION]) + struct.pack("<I", len(header)) + header)
+        for block in blocks:
+            f.write(block)
+    os.replace(tmp_path, path)
+
+
+@dataclass
+class SnapshotFile:
+    """A changed file restored from a snapshot, shaped like PyGithub's File"""
+    filename: str
+    status: str
+    additions: int
+    deletions: int
+    patch: str | None
+    sha: str | None
+    previous_filename: str | None
+
+
+class Snapshot:
+    """Memory-mapped, read-only view of a snapshot file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a PR Manager snapshot")
+        version = self._mm[len(MAGIC)]
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version {version} (expected {VERSION})")
+
+        start = len(MAGIC) + 1
+        (header_length,) = struct.unpack_from("<I", self._mm, start)
+        data_start = start + 4 + header_length
+        header = json.loads(self._mm[start + 4:data_start])
+        if header.get("byteorder") != "little":
+            raise ValueError(f"Unsupported snapshot byte order {header.get('byteorder')!r}")
+        self.created_at = datetime.fromisoformat(header["created_at"])
+        self.orgs: list[str] = header["orgs"]
+        self.count: int = header["count"]
+
+        self._ints: dict[str, memoryview | array] = {}
+        self._strings: dict[str, tuple[memoryview | array, int]] = {}  # name -> (offsets, data start)
+        for name, column in header["columns"].items():
+            begin = data_start + column["offset"]
+            if column["type"] == "int":
+                self._ints[name] = self._integers(begin, column["length"], "q")
+            else:
+                offsets_length = (self.count + 1) * 4
+                self._strings[name] = (self._integers(begin, offsets_length, "I"), begin + offsets_length)
+
+        self._diff_block = header["diffs"]
+        if self._diff_block:
+            self._diff_block = (data_start + self._diff_block["offset"], self._diff_block["length"])
+        self._diffs: dict[str, list[dict]] | None = None
+        # repo full name -> {"per_page", "pages": [[url, etag, last_modified, link]]}
+        self.listings: dict[str, dict] = header.get("listings", {})
+
+    def _integers(self, begin: int, length: int, typecode: str) -> memoryview | array:
+        """View little-endian integers in place, or copy and swap them on big-endian hosts"""
+        if sys.byteorder == "little":
+            return memoryview(self._mm)[begin:begin + length].cast(typecode)
+        values = array(typecode, self._mm[begin:begin + length])
+        values.byteswap()
+        return values
+
+    def __len__(self) -> int:
+        return self.count
+
+    def integer(self, column: str, row: int) -> int:
+        return self._ints[column][row]
+
+    def string(self, column: str, row: int) -> str:
+        offsets, data_start = self._strings[column]
+        return self._mm[data_start + offsets[row]:data_start + offsets[row + 1]].decode("utf-8")
+
+    def column(self, name: str) -> list:
+        """Decode a whole column at once, much faster than row by row"""
+        if name in self._ints:
+            return self._ints[name].tolist()
+        offsets, data_start = self._strings[name]
+        bounds = offsets.tolist()
+        data = self._mm[data_start:data_start + bounds[-1]]
+        return [data[bounds[i]:bounds[i + 1]].decode("utf-8") for i in range(self.count)]
+
+    def stats_entries(self, rows: list["SnapshotPR"]) -> list[PRStatsEntry]:
+        """Build the dashboard entries of the given rows from whole columns"""
+        org, repo, title, author, reviewers, teams = (
+            self.column(name) for name in ("org", "repo", "title", "author", "requested_reviewers", "requested_teams")
+        )
+        number, created_at = self.column("number"), self.column("created_at")
+        entries = []
+        for pr in rows:
+            i = pr._row
+            entries.append(PRStatsEntry(
+                key=(repo[i], number[i]),
+                org=org[i],
+                repo=repo[i],
+                number=number[i],
+                title=title[i],
+                author=author[i],
+                created_at=datetime.fromtimestamp(created_at[i], timezone.utc),
+                awaiting_review=bool(reviewers[i] or teams[i]),
+            ))
+        return entries
+
+    def rows(self, orgs: list[str] | None = None) -> list["SnapshotPR"]:
+        """Return lazily decoded rows, optionally only those of the given orgs"""
+        rows = [SnapshotPR(self, row) for row in range(self.count)]
+        if orgs is not None:
+            wanted = {org.lower() for org in orgs}
+            rows = [pr for pr in rows if pr.org.lower() in wanted]
+        return rows
+
+    def listed_repos(self, orgs: list[str]) -> set[str]:
+        """Repos of the given orgs whose listing validators are stored"""
+        wanted = {org.lower() for org in orgs}
+        return {repo for repo in self.listings if repo.split("/", 1)[0].lower() in wanted}
+
+    def listing_pages(self, orgs: list[str]) -> list[tuple[str, str | None, str | None, str | None, str]]:
+        """Rebuild the stored open pulls listing pages of the given orgs from the rows
+
+        Returns (url, ETag, Last-Modified, Link, body) per page.
+        """
+        rows_by_repo: dict[str, list[int]] = {}
+        for row, repo in enumerate(self.column("repo")):
+            rows_by_repo.setdefault(repo, []).append(row)
+        pages = []
+        for repo in self.listed_repos(orgs):
+            listing = self.listings[repo]
+            rows = rows_by_repo.get(repo, [])
+            page_size = listing["per_page"]
+            for i, (url, etag, last_modified, link) in enumerate(listing["pages"]):
+                payload = [list_payload(SnapshotPR(self, row)) for row in rows[i * page_size:(i + 1) * page_size]]
+                pages.append((url, etag, last_modified, link, json.dumps(payload)))
+        return pages
+
+    def all_diffs(self) -> dict[str, list[dict]]:
+        """Decompress the cached diffs on first use"""
+        if self._diffs is None:
+            self._diffs = {}
+            if self._diff_block:
+                offset, length = self._diff_block
+                self._diffs = json.loads(zlib.decompress(self._mm[offset:offset + length]))
+        return self._diffs
+
+
+class SnapshotPR(PRRecord):
+    """A snapshot row decoding its fields from the mapped columns on access"""
+
+    __slots__ = ("_snapshot", "_row")
+
+    size = SNAPSHOT_ROW_BYTES
+    unavailable_reason = "not in the snapshot"
+
+    def __init__(self, snapshot: Snapshot, row: int):
+        self._snapshot = snapshot
+        self._row = row
+
+    def _str(self, name: str) -> str:
+        return self._snapshot.string(name, self._row)
+
+    def _int(self, name: str) -> int:
+        return self._snapshot.integer(name, self._row)
+
+    def get_files(self) -> list[SnapshotFile]:
+        files = self._snapshot.all_diffs().get(diff_key(self._str("repo"), self.number))
+        if files is None:
+            raise OfflineError(f"The diff of this PR is {self.unavailable_reason}")
+        return [SnapshotFile(**file) for file in files]
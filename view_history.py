@@ -0,0 +1,29 @@
+"""
+View History - Remembers the head SHA of each PR when its files were last viewed
+"""
+
+from github import PullRequest
+
+from app_state import load_state, save_state
+
+
+class ViewHistory:
+    """Persisted map of PR to the head SHA last seen in the files view"""
+
+    STATE_NAME = "last_viewed"
+
+    def __init__(self):
+        self._last_viewed: dict[str, str] = load_state(self.STATE_NAME)
+
+    @staticmethod
+    def _key(pr: PullRequest.PullRequest) -> str:
+        return f"{pr.base.repo.full_name}#{pr.number}"
+
+    def last_viewed_sha(self, pr: PullRequest.PullRequest) -> str | None:
+        return self._last_viewed.get(self._key(pr))
+
+    def mark_viewed(self, pr: PullRequest.PullRequest, sha: str) -> None:
+        """Record the head SHA that was just viewed and persist it"""
+        if self._last_viewed.get(self._key(pr)) != sha:
+            self._last_viewed[self._key(pr)] = sha
+            save_state(self.STATE_NAME, self._last_viewed)